@@ -0,0 +1,39 @@
+"""create game_clocks table
+
+Revision ID: 0c9d2e5f8a31
+Revises: a4f19d3e7b60
+Create Date: 2026-10-19 16:08:45.771902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c9d2e5f8a31'
+down_revision: Union[str, Sequence[str], None] = 'a4f19d3e7b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('game_clocks',
+    sa.Column('game_id', sa.String(length=16), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('initial', sa.Integer(), nullable=False),
+    sa.Column('increment', sa.Integer(), nullable=False),
+    sa.Column('clocks', postgresql.ARRAY(sa.Integer()), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('game_id')
+    )
+    op.create_index('idx_game_clocks_user', 'game_clocks', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_game_clocks_user', table_name='game_clocks')
+    op.drop_table('game_clocks')
@@ -0,0 +1,28 @@
+"""add last_login_at to users
+
+Revision ID: 3f2a9c7d1e84
+Revises: c1567d3d1d14
+Create Date: 2026-10-19 10:12:31.418223
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c7d1e84'
+down_revision: Union[str, Sequence[str], None] = 'c1567d3d1d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('last_login_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'last_login_at')
@@ -0,0 +1,64 @@
+"""encode game enum columns as smallint and drop url
+
+Revision ID: 5b7e3a91c4d2
+Revises: 8d41b6e0c2a7
+Create Date: 2026-10-19 12:27:40.553018
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e3a91c4d2'
+down_revision: Union[str, Sequence[str], None] = '8d41b6e0c2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CODED_COLUMNS = {
+    "perf_type": (50, (
+        "ultraBullet", "bullet", "blitz", "rapid", "classical", "correspondence",
+        "chess960", "crazyhouse", "antichess", "atomic", "horde", "kingOfTheHill",
+        "racingKings", "threeCheck", "fromPosition",
+    )),
+    "user_color": (10, ("white", "black")),
+    "result": (10, ("win", "loss", "draw")),
+    "termination": (50, (
+        "normal", "checkmate", "resignation", "time", "timeout", "draw",
+        "stalemate", "cheat", "abandoned", "unknown", "variant_end",
+    )),
+}
+
+
+def _to_code(column: str, values: tuple[str, ...]) -> str:
+    cases = " ".join(f"WHEN '{value}' THEN {code}" for code, value in enumerate(values))
+    return f"CASE {column} {cases} ELSE -1 END"
+
+
+def _to_string(column: str, values: tuple[str, ...]) -> str:
+    cases = " ".join(f"WHEN {code} THEN '{value}'" for code, value in enumerate(values))
+    return f"CASE {column} {cases} ELSE 'unknown' END"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    alterations = ", ".join(
+        f"ALTER COLUMN {column} TYPE SMALLINT USING {_to_code(column, values)}"
+        for column, (_, values) in CODED_COLUMNS.items()
+    )
+    op.execute(f"ALTER TABLE games {alterations}")
+    op.drop_column('games', 'url')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    alterations = ", ".join(
+        f"ALTER COLUMN {column} TYPE VARCHAR({length}) USING {_to_string(column, values)}"
+        for column, (length, values) in CODED_COLUMNS.items()
+    )
+    op.execute(f"ALTER TABLE games {alterations}")
+    op.add_column('games', sa.Column('url', sa.String(length=512), nullable=True))
+    op.execute("UPDATE games SET url = 'https://lichess.org/' || id")
+    op.alter_column('games', 'url', existing_type=sa.String(length=512), nullable=False)
@@ -0,0 +1,45 @@
+"""create games_staging table
+
+Revision ID: 7e2b5c8d1f46
+Revises: 0c9d2e5f8a31
+Create Date: 2026-10-19 17:02:13.408215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2b5c8d1f46'
+down_revision: Union[str, Sequence[str], None] = '0c9d2e5f8a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # staged rows are rebuilt from Lichess on failure, so skip the WAL
+    op.create_table('games_staging',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('id', sa.String(length=16), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('perf_type', sa.SmallInteger(), nullable=False),
+    sa.Column('time_control', sa.String(length=50), nullable=True),
+    sa.Column('opponent_name', sa.String(length=255), nullable=False),
+    sa.Column('opponent_rating', sa.Integer(), nullable=True),
+    sa.Column('user_color', sa.SmallInteger(), nullable=False),
+    sa.Column('result', sa.SmallInteger(), nullable=False),
+    sa.Column('termination', sa.SmallInteger(), nullable=False),
+    sa.Column('opening_eco', sa.String(length=3), nullable=True),
+    sa.Column('opening_name', sa.String(length=255), nullable=True),
+    sa.Column('imported_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'id'),
+    prefixes=['UNLOGGED']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('games_staging')
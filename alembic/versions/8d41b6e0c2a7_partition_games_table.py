@@ -0,0 +1,192 @@
+"""partition games table
+
+Revision ID: 8d41b6e0c2a7
+Revises: 3f2a9c7d1e84
+Create Date: 2026-10-19 11:03:52.120946
+
+Opt-in: run with ``alembic -x games_partitioning=hash upgrade head``
+(hash on user_id, ``-x games_partitions=N`` partitions, default 16) or
+``-x games_partitioning=range`` (yearly ranges on created_at). Without the
+option the revision is recorded and the table is left as is.
+
+The new table is filled in committed batches while a trigger mirrors
+concurrent writes, then swapped in under a short exclusive lock.
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41b6e0c2a7'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c7d1e84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+COLUMNS = (
+    "id, user_id, created_at, perf_type, time_control, opponent_name, "
+    "opponent_rating, user_color, result, termination, url, imported_at"
+)
+
+
+def _create_table(name: str, primary_key: str, partition_clause: str = "") -> None:
+    op.execute(f"""
+        CREATE TABLE {name} (
+            id VARCHAR(16) NOT NULL,
+            user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            perf_type VARCHAR(50) NOT NULL,
+            time_control VARCHAR(50),
+            opponent_name VARCHAR(255) NOT NULL,
+            opponent_rating INTEGER,
+            user_color VARCHAR(10) NOT NULL,
+            result VARCHAR(10) NOT NULL,
+            termination VARCHAR(50) NOT NULL,
+            url VARCHAR(512) NOT NULL,
+            imported_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT {name}_pkey PRIMARY KEY ({primary_key})
+        ) {partition_clause}
+    """)
+    op.create_index(f'idx_{name}_user_created', name, ['user_id', 'created_at'], unique=False)
+    op.create_index(f'idx_{name}_user_perf', name, ['user_id', 'perf_type'], unique=False)
+
+
+def _create_partitions(strategy: str, partitions: int) -> None:
+    if strategy == "hash":
+        for remainder in range(partitions):
+            op.execute(
+                f"CREATE TABLE games_p{remainder} PARTITION OF games_partitioned "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            )
+        return
+    
+    first_year = op.get_bind().execute(
+        sa.text("SELECT EXTRACT(YEAR FROM MIN(created_at))::int FROM games")
+    ).scalar() or datetime.utcnow().year
+    
+    for year in range(first_year, datetime.utcnow().year + 2):
+        op.execute(
+            f"CREATE TABLE games_y{year} PARTITION OF games_partitioned "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    op.execute("CREATE TABLE games_default PARTITION OF games_partitioned DEFAULT")
+
+
+def _install_mirror_trigger(target: str, source: str) -> None:
+    op.execute(f"""
+        CREATE FUNCTION {source}_mirror() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {target} WHERE id = OLD.id AND user_id = OLD.user_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {target} ({COLUMNS})
+                VALUES (NEW.id, NEW.user_id, NEW.created_at, NEW.perf_type,
+                        NEW.time_control, NEW.opponent_name, NEW.opponent_rating,
+                        NEW.user_color, NEW.result, NEW.termination, NEW.url,
+                        NEW.imported_at)
+                ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        CREATE TRIGGER {source}_mirror AFTER INSERT OR UPDATE OR DELETE ON {source}
+        FOR EACH ROW EXECUTE FUNCTION {source}_mirror()
+    """)
+
+
+def _drop_mirror_trigger(source: str) -> None:
+    op.execute(f"DROP TRIGGER IF EXISTS {source}_mirror ON {source}")
+    op.execute(f"DROP FUNCTION IF EXISTS {source}_mirror()")
+
+
+def _backfill(target: str, source: str) -> None:
+    bind = op.get_bind()
+    last_id = ""
+    
+    while True:
+        with context.get_context().autocommit_block():
+            # FOR SHARE makes the copy wait for a concurrent delete or update
+            # of a row and then skip or re-read it, so the mirror trigger's
+            # delete can never run before the copy lands; the page is taken
+            # without locks so skipped rows do not end the loop early
+            last_id = bind.execute(sa.text(f"""
+                WITH page AS (
+                    SELECT id FROM {source}
+                    WHERE id > :last_id
+                    ORDER BY id
+                    LIMIT :batch_size
+                ), batch AS (
+                    SELECT {COLUMNS} FROM {source}
+                    WHERE id IN (SELECT id FROM page)
+                    FOR SHARE
+                ), inserted AS (
+                    INSERT INTO {target} ({COLUMNS})
+                    SELECT {COLUMNS} FROM batch
+                    ON CONFLICT DO NOTHING
+                )
+                SELECT MAX(id) FROM page
+            """), {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE}).scalar()
+        
+        if last_id is None:
+            break
+
+
+def _swap(new_name: str) -> None:
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute("LOCK TABLE games IN ACCESS EXCLUSIVE MODE")
+    _drop_mirror_trigger("games")
+    op.execute("ALTER TABLE games RENAME TO games_old")
+    op.execute(f"ALTER TABLE {new_name} RENAME TO games")
+    op.execute("DROP TABLE games_old")
+    op.execute(f"ALTER TABLE games RENAME CONSTRAINT {new_name}_pkey TO games_pkey")
+    op.execute(
+        f"ALTER TABLE games RENAME CONSTRAINT {new_name}_user_id_fkey TO games_user_id_fkey"
+    )
+    op.execute(f"ALTER INDEX idx_{new_name}_user_created RENAME TO idx_games_user_created")
+    op.execute(f"ALTER INDEX idx_{new_name}_user_perf RENAME TO idx_games_user_perf")
+
+
+def _is_partitioned() -> bool:
+    return bool(op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = 'games'"
+    )).scalar())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    x_args = context.get_x_argument(as_dictionary=True)
+    strategy = x_args.get("games_partitioning")
+    if strategy is None or _is_partitioned():
+        return
+    if strategy not in ("hash", "range"):
+        raise ValueError("games_partitioning must be 'hash' or 'range'")
+    
+    if strategy == "hash":
+        _create_table("games_partitioned", "user_id, id", "PARTITION BY HASH (user_id)")
+    else:
+        _create_table("games_partitioned", "created_at, id", "PARTITION BY RANGE (created_at)")
+    _create_partitions(strategy, int(x_args.get("games_partitions", 16)))
+    _install_mirror_trigger("games_partitioned", "games")
+    
+    _backfill("games_partitioned", "games")
+    _swap("games_partitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _is_partitioned():
+        return
+    
+    _create_table("games_unpartitioned", "id")
+    _install_mirror_trigger("games_unpartitioned", "games")
+    
+    _backfill("games_unpartitioned", "games")
+    _swap("games_unpartitioned")
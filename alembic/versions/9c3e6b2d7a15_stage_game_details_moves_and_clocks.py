@@ -0,0 +1,48 @@
+"""stage game details, moves and clocks
+
+Revision ID: 9c3e6b2d7a15
+Revises: f5e8a2b7c310
+Create Date: 2026-10-19 20:14:37.902614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e6b2d7a15'
+down_revision: Union[str, Sequence[str], None] = 'f5e8a2b7c310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # in-flight rebuilds staged without these columns cannot be swapped
+    op.execute("TRUNCATE games_staging")
+    op.add_column('games_staging', sa.Column('time_control', sa.String(length=50), nullable=True))
+    op.add_column('games_staging', sa.Column('termination', sa.SmallInteger(), nullable=False))
+    op.add_column('games_staging', sa.Column('opening_eco', sa.String(length=3), nullable=True))
+    op.add_column('games_staging', sa.Column('opening_name', sa.String(length=255), nullable=True))
+    op.add_column('games_staging', sa.Column('moves', sa.LargeBinary(), nullable=True))
+    op.add_column('games_staging', sa.Column('clock_initial', sa.Integer(), nullable=True))
+    op.add_column('games_staging', sa.Column('clock_increment', sa.Integer(), nullable=True))
+    op.add_column('games_staging', sa.Column('clocks', sa.ARRAY(sa.Integer()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("TRUNCATE games_staging")
+    for column in (
+        'clocks',
+        'clock_increment',
+        'clock_initial',
+        'moves',
+        'opening_name',
+        'opening_eco',
+        'termination',
+        'time_control',
+    ):
+        op.drop_column('games_staging', column)
@@ -0,0 +1,45 @@
+"""add opening columns and opening_stats table
+
+Revision ID: a4f19d3e7b60
+Revises: e6c08f2d9b13
+Create Date: 2026-10-19 14:55:12.064381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f19d3e7b60'
+down_revision: Union[str, Sequence[str], None] = 'e6c08f2d9b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('games', sa.Column('opening_eco', sa.String(length=3), nullable=True))
+    op.add_column('games', sa.Column('opening_name', sa.String(length=255), nullable=True))
+    op.create_table('opening_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('user_color', sa.SmallInteger(), nullable=False),
+    sa.Column('path', sa.String(length=255), nullable=False),
+    sa.Column('parent', sa.String(length=255), nullable=False),
+    sa.Column('eco', sa.String(length=3), nullable=True),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('draws', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'user_color', 'path')
+    )
+    op.create_index('idx_opening_stats_parent', 'opening_stats', ['user_id', 'user_color', 'parent'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_opening_stats_parent', table_name='opening_stats')
+    op.drop_table('opening_stats')
+    op.drop_column('games', 'opening_name')
+    op.drop_column('games', 'opening_eco')
@@ -0,0 +1,53 @@
+"""create games archive tables
+
+Revision ID: b81d4f6a2c95
+Revises: 7e2b5c8d1f46
+Create Date: 2026-10-19 17:48:37.215904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d4f6a2c95'
+down_revision: Union[str, Sequence[str], None] = '7e2b5c8d1f46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # widest fixed-size columns first so rows carry no alignment padding
+    op.create_table('games_archive',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('imported_at', sa.DateTime(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('opponent_rating', sa.Integer(), nullable=True),
+    sa.Column('perf_type', sa.SmallInteger(), nullable=False),
+    sa.Column('user_color', sa.SmallInteger(), nullable=False),
+    sa.Column('result', sa.SmallInteger(), nullable=False),
+    sa.Column('termination', sa.SmallInteger(), nullable=False),
+    sa.Column('id', sa.String(length=16), nullable=False),
+    sa.Column('time_control', sa.String(length=50), nullable=True),
+    sa.Column('opponent_name', sa.String(length=255), nullable=False),
+    sa.Column('opening_eco', sa.String(length=3), nullable=True),
+    sa.Column('opening_name', sa.String(length=255), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'created_at', 'id')
+    )
+    op.create_table('games_archive_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('perf_type', sa.SmallInteger(), nullable=False),
+    sa.Column('games', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'perf_type')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('games_archive_stats')
+    op.drop_table('games_archive')
@@ -0,0 +1,106 @@
+"""split canonical lichess_games out of per-user games
+
+Revision ID: d3a7c1e9f024
+Revises: b81d4f6a2c95
+Create Date: 2026-10-19 18:36:05.912447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7c1e9f024'
+down_revision: Union[str, Sequence[str], None] = 'b81d4f6a2c95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DETAIL_COLUMNS = "id, time_control, termination, opening_eco, opening_name"
+
+PARTICIPANT_TABLES = ("games", "games_archive", "games_staging")
+
+
+def _partition_strategy() -> str | None:
+    return op.get_bind().execute(sa.text(
+        "SELECT p.partstrat FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = 'games'"
+    )).scalar()
+
+
+def _replace_games_pkey(columns: str) -> None:
+    op.execute("ALTER TABLE games DROP CONSTRAINT games_pkey")
+    op.execute(f"ALTER TABLE games ADD CONSTRAINT games_pkey PRIMARY KEY ({columns})")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('lichess_games',
+    sa.Column('id', sa.String(length=16), nullable=False),
+    sa.Column('time_control', sa.String(length=50), nullable=True),
+    sa.Column('termination', sa.SmallInteger(), nullable=False),
+    sa.Column('opening_eco', sa.String(length=3), nullable=True),
+    sa.Column('opening_name', sa.String(length=255), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    for table in ("games", "games_archive"):
+        op.execute(
+            f"INSERT INTO lichess_games ({DETAIL_COLUMNS}) "
+            f"SELECT {DETAIL_COLUMNS} FROM {table} ON CONFLICT DO NOTHING"
+        )
+    
+    # the partition key has to stay part of the primary key
+    if _partition_strategy() == "r":
+        _replace_games_pkey("user_id, id, created_at")
+    else:
+        _replace_games_pkey("user_id, id")
+    
+    op.execute("TRUNCATE games_staging")
+    for table in PARTICIPANT_TABLES:
+        op.execute(
+            f"ALTER TABLE {table} DROP COLUMN time_control, DROP COLUMN termination, "
+            "DROP COLUMN opening_eco, DROP COLUMN opening_name"
+        )
+    
+    op.execute("ALTER TABLE game_clocks DROP CONSTRAINT game_clocks_pkey")
+    op.create_primary_key('game_clocks_pkey', 'game_clocks', ['game_id', 'user_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "DELETE FROM game_clocks c USING game_clocks d "
+        "WHERE c.game_id = d.game_id AND c.user_id > d.user_id"
+    )
+    op.execute("ALTER TABLE game_clocks DROP CONSTRAINT game_clocks_pkey")
+    op.create_primary_key('game_clocks_pkey', 'game_clocks', ['game_id'])
+    
+    for table in PARTICIPANT_TABLES:
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN time_control VARCHAR(50), "
+            "ADD COLUMN termination SMALLINT, ADD COLUMN opening_eco VARCHAR(3), "
+            "ADD COLUMN opening_name VARCHAR(255)"
+        )
+        op.execute(
+            f"UPDATE {table} t SET time_control = l.time_control, termination = l.termination, "
+            "opening_eco = l.opening_eco, opening_name = l.opening_name "
+            "FROM lichess_games l WHERE l.id = t.id"
+        )
+        op.execute(f"UPDATE {table} SET termination = -1 WHERE termination IS NULL")
+        op.alter_column(table, 'termination', existing_type=sa.SmallInteger(), nullable=False)
+    
+    # games shared by two users keep only the first participant
+    op.execute(
+        "DELETE FROM games g USING games d "
+        "WHERE g.id = d.id AND g.user_id > d.user_id"
+    )
+    strategy = _partition_strategy()
+    if strategy == "h":
+        _replace_games_pkey("id, user_id")
+    elif strategy == "r":
+        _replace_games_pkey("id, created_at")
+    else:
+        _replace_games_pkey("id")
+    
+    op.drop_table('lichess_games')
@@ -0,0 +1,35 @@
+"""create game_moves table
+
+Revision ID: e6c08f2d9b13
+Revises: 5b7e3a91c4d2
+Create Date: 2026-10-19 13:41:08.902217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6c08f2d9b13'
+down_revision: Union[str, Sequence[str], None] = '5b7e3a91c4d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('game_moves',
+    sa.Column('game_id', sa.String(length=16), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('moves', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('game_id')
+    )
+    op.execute("ALTER TABLE game_moves ALTER COLUMN moves SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('game_moves')
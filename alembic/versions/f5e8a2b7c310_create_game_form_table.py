@@ -0,0 +1,38 @@
+"""create game_form table
+
+Revision ID: f5e8a2b7c310
+Revises: d3a7c1e9f024
+Create Date: 2026-10-19 19:21:48.530176
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5e8a2b7c310'
+down_revision: Union[str, Sequence[str], None] = 'd3a7c1e9f024'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('game_form',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('perf_type', sa.SmallInteger(), nullable=False),
+    sa.Column('current_streak', sa.Integer(), nullable=False),
+    sa.Column('longest_win_streak', sa.Integer(), nullable=False),
+    sa.Column('longest_loss_streak', sa.Integer(), nullable=False),
+    sa.Column('last_game_at', sa.DateTime(), nullable=True),
+    sa.Column('daily', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'perf_type')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('game_form')
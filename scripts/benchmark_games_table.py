@@ -0,0 +1,84 @@
+import argparse
+import json
+import statistics
+import time
+
+from sqlalchemy import select, func
+
+from src.games.models import Game
+from src.games.tasks import get_session
+from scripts.seed import clear_seed, seed_games
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+    }
+
+
+def benchmark_list(session, user_ids: list[int], pages: list[int], limit: int, rounds: int) -> dict:
+    results = {}
+    for page in pages:
+        samples = []
+        for round_index in range(rounds):
+            user_id = user_ids[round_index % len(user_ids)]
+            query = (
+                select(Game)
+                .where(Game.user_id == user_id)
+                .order_by(Game.created_at.desc())
+            )
+            start = time.perf_counter()
+            session.execute(select(func.count()).select_from(query.subquery())).scalar()
+            session.execute(query.offset((page - 1) * limit).limit(limit)).scalars().all()
+            samples.append(time.perf_counter() - start)
+        results[f"page_{page}"] = summarize(samples)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark games insert and list latency")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--games-per-user", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 50, 200])
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    
+    with get_session() as session:
+        clear_seed(session)
+        
+        start = time.perf_counter()
+        user_ids = seed_games(session, args.users, args.games_per_user)
+        insert_elapsed = time.perf_counter() - start
+        total_games = args.users * args.games_per_user
+        
+        report = {
+            "users": args.users,
+            "games_per_user": args.games_per_user,
+            "insert": {
+                "seconds": round(insert_elapsed, 3),
+                "games_per_sec": round(total_games / insert_elapsed, 1),
+            },
+            "list": benchmark_list(session, user_ids, args.pages, args.limit, args.rounds),
+        }
+        
+        clear_seed(session)
+    
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import argparse
+import json
+import random
+import string
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from src.auth.models import User
+from src.games.tasks import (
+    SYNC_BATCH_SIZE,
+    SyncBatch,
+    SyncStats,
+    get_session,
+    read_game_line,
+    write_batch,
+)
+from scripts.seed import SEED_PREFIX, TIME_CONTROLS, clear_seed
+
+BENCH_USERNAME = f"{SEED_PREFIX}moves_bench"
+
+STATUSES = ["mate", "resign", "outoftime", "draw", "stalemate"]
+PIECES = ["", "", "", "N", "B", "R", "Q", "K"]
+
+
+def san_move(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.02:
+        return rng.choice(["O-O", "O-O-O"])
+    
+    piece = rng.choice(PIECES)
+    capture = "x" if rng.random() < 0.2 else ""
+    origin = rng.choice(string.ascii_lowercase[:8]) if capture and not piece else ""
+    square = rng.choice(string.ascii_lowercase[:8]) + rng.choice("12345678")
+    check = "+" if rng.random() < 0.08 else ""
+    return f"{piece}{origin}{capture}{square}{check}"
+
+
+def synthetic_games(rng: random.Random, count: int) -> list[dict]:
+    start = datetime.utcnow() - timedelta(days=365)
+    games = []
+    for index in range(count):
+        perf_type = rng.choice(list(TIME_CONTROLS))
+        user_color = rng.choice(["white", "black"])
+        opponent_color = "black" if user_color == "white" else "white"
+        game = {
+            "id": "".join(rng.choices(string.ascii_letters + string.digits, k=8)),
+            "createdAt": int((start + timedelta(minutes=index * 15)).timestamp() * 1000),
+            "perf": perf_type,
+            "status": rng.choice(STATUSES),
+            "players": {
+                user_color: {"user": {"name": BENCH_USERNAME}, "rating": 1500},
+                opponent_color: {
+                    "user": {"name": f"opponent_{rng.randrange(count // 10 + 1)}"},
+                    "rating": rng.randint(800, 2800),
+                },
+            },
+            "opening": {"eco": "C20", "name": "King's Pawn Game"},
+            "moves": " ".join(san_move(rng) for _ in range(rng.randint(20, 140))),
+        }
+        if rng.random() < 0.7:
+            game["winner"] = rng.choice(["white", "black"])
+        if perf_type != "correspondence":
+            game["clock"] = {"initial": 180, "increment": 2}
+        games.append(game)
+    return games
+
+
+def recorded_games(path: str) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def stream_lines(games: list[dict], store_moves: bool) -> list[str]:
+    # without the mode Lichess is asked for moves=false, so the lines carry no moves
+    lines = []
+    for game in games:
+        if not store_moves:
+            game = {key: value for key, value in game.items() if key != "moves"}
+        lines.append(json.dumps(game))
+    return lines
+
+
+def storage_per_game(session, user_id: int) -> dict:
+    games_bytes, details_bytes, moves_bytes, games = session.execute(text("""
+        SELECT
+            (SELECT COALESCE(SUM(pg_column_size(g.*)), 0) FROM games g WHERE g.user_id = :user_id),
+            (SELECT COALESCE(SUM(pg_column_size(l.*)), 0) FROM lichess_games l
+             JOIN games g ON g.id = l.id WHERE g.user_id = :user_id),
+            (SELECT COALESCE(SUM(pg_column_size(m.*)), 0) FROM game_moves m WHERE m.user_id = :user_id),
+            (SELECT COUNT(*) FROM games g WHERE g.user_id = :user_id)
+    """), {"user_id": user_id}).one()
+    if not games:
+        return {"games": 0}
+    
+    return {
+        "games": games,
+        "games_row_bytes": round(games_bytes / games, 1),
+        "details_row_bytes": round(details_bytes / games, 1),
+        "moves_row_bytes": round(moves_bytes / games, 1),
+        "total_bytes": round((games_bytes + details_bytes + moves_bytes) / games, 1),
+    }
+
+
+def run_mode(session, username: str, lines: list[str], store_moves: bool) -> dict:
+    clear_seed(session)
+    # the seed prefix keeps the user removable by clear_seed whatever the recorded name
+    user = User(lichess_id=BENCH_USERNAME, username=username)
+    session.add(user)
+    session.commit()
+    
+    stats = SyncStats()
+    stats.bytes_received = sum(len(line) + 1 for line in lines)
+    batch = SyncBatch(user.id, store_moves, False)
+    
+    start = time.perf_counter()
+    for line in lines:
+        game = read_game_line(line, user.id, username, stats)
+        if game is None:
+            continue
+        batch.add(*game)
+        
+        if len(batch) >= SYNC_BATCH_SIZE:
+            write_batch(session, batch, stats)
+            batch = SyncBatch(user.id, store_moves, False)
+    
+    if len(batch):
+        write_batch(session, batch, stats)
+    elapsed = time.perf_counter() - start
+    
+    return {
+        "seconds": round(elapsed, 3),
+        "games_per_sec": round(stats.games / elapsed, 1),
+        "stream_bytes_per_game": round(stats.bytes_received / max(stats.games, 1), 1),
+        "stages": {name: round(value, 3) for name, value in stats.timings.items()},
+        "storage_per_game": storage_per_game(session, user.id),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark storage per game and sync throughput with move storage on and off"
+    )
+    parser.add_argument("--games", type=int, default=20000)
+    parser.add_argument(
+        "--input",
+        default=None,
+        help="recorded NDJSON export (moves=true) to replay against a scratch database"
+    )
+    parser.add_argument("--username", default=BENCH_USERNAME, help="player whose games --input holds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    
+    if args.input:
+        games = recorded_games(args.input)
+        username = args.username
+    else:
+        games = synthetic_games(random.Random(args.seed), args.games)
+        username = BENCH_USERNAME
+    
+    with get_session() as session:
+        report = {
+            "games": len(games),
+            "source": args.input or "synthetic",
+            "store_moves_off": run_mode(session, username, stream_lines(games, False), False),
+            "store_moves_on": run_mode(session, username, stream_lines(games, True), True),
+        }
+        clear_seed(session)
+    
+    off = report["store_moves_off"]
+    on = report["store_moves_on"]
+    report["extra_bytes_per_game"] = round(
+        on["storage_per_game"]["total_bytes"] - off["storage_per_game"]["total_bytes"], 1
+    )
+    report["throughput_ratio"] = round(on["games_per_sec"] / off["games_per_sec"], 3)
+    
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from scripts.benchmark_games_table import percentile
+
+# measured on the reference box after deferring worker setup: p50 ~1.0s
+# (down from ~1.2s) and ~86MB RSS, with headroom for noisy CI machines
+DEFAULT_BUDGET_MS = 2500.0
+DEFAULT_BUDGET_RSS_MB = 120.0
+
+WORKER_MODULES = ("celery", "numpy", "psycopg2")
+
+PROBE = """
+import json
+import resource
+import sys
+import time
+
+start = time.perf_counter()
+import src.main
+elapsed = time.perf_counter() - start
+
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "celery_loaded": "celery" in sys.modules,
+    "numpy_loaded": "numpy" in sys.modules,
+    "psycopg2_loaded": "psycopg2" in sys.modules,
+}))
+"""
+
+
+def run_probe() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time and memory of the API")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--budget-rss-mb", type=float, default=DEFAULT_BUDGET_RSS_MB)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    
+    probes = [run_probe() for _ in range(args.runs)]
+    import_samples = [probe["import_ms"] for probe in probes]
+    rss_samples = [probe["rss_mb"] for probe in probes]
+    
+    report = {
+        "runs": args.runs,
+        "import_ms": {
+            "p50": round(percentile(import_samples, 0.50), 1),
+            "max": round(max(import_samples), 1),
+            "mean": round(statistics.mean(import_samples), 1),
+        },
+        "rss_mb": round(max(rss_samples), 1),
+        "worker_modules_loaded": {
+            name: probes[-1][f"{name}_loaded"]
+            for name in WORKER_MODULES
+        },
+    }
+    
+    violations = []
+    if report["import_ms"]["p50"] > args.budget_ms:
+        violations.append(f"import p50 {report['import_ms']['p50']}ms > {args.budget_ms}ms")
+    if report["rss_mb"] > args.budget_rss_mb:
+        violations.append(f"rss {report['rss_mb']}MB > {args.budget_rss_mb}MB")
+    for name, loaded in report["worker_modules_loaded"].items():
+        if loaded:
+            violations.append(f"{name} imported by src.main")
+    report["violations"] = violations
+    
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
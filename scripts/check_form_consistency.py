@@ -0,0 +1,123 @@
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+import src.models  # noqa: F401 - registers every mapper before the session is used
+from src.auth.models import User
+from src.games.form import apply_games, empty_form
+from src.games.models import Game, GameArchive, GameForm
+from src.games.tasks import form_state, update_game_form
+
+PERF_TYPES = ("bullet", "blitz", "rapid")
+
+FORM_TABLES = [
+    User.__table__,
+    Game.__table__,
+    GameArchive.__table__,
+    GameForm.__table__,
+]
+
+
+def random_games(rng: random.Random, user_id: int, count: int) -> list[dict]:
+    start = datetime(2024, 1, 1)
+    games = []
+    for index in range(count):
+        games.append({
+            "id": f"g{index:06d}",
+            "user_id": user_id,
+            "created_at": start + timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+            "perf_type": rng.choice(PERF_TYPES),
+            "opponent_name": f"opponent{rng.randint(0, 20)}",
+            "opponent_rating": rng.choice([None, rng.randint(800, 2800)]),
+            "user_color": rng.choice(["white", "black"]),
+            "result": rng.choice(["win", "win", "loss", "draw"]),
+        })
+    return games
+
+
+def random_batches(rng: random.Random, games: list[dict], shuffled: bool) -> list[list[dict]]:
+    if shuffled:
+        games = list(games)
+        rng.shuffle(games)
+
+    batches = []
+    while games:
+        size = rng.randint(1, max(1, len(games) // 3))
+        batches.append(games[:size])
+        games = games[size:]
+    return batches
+
+
+def expected_forms(games: list[dict]) -> dict:
+    grouped = {}
+    for game in games:
+        grouped.setdefault(game["perf_type"], []).append(game)
+    return {
+        perf_type: apply_games(empty_form(), perf_games)
+        for perf_type, perf_games in grouped.items()
+    }
+
+
+def stored_forms(session: Session, user_id: int) -> dict:
+    forms = session.execute(select(GameForm).where(GameForm.user_id == user_id)).scalars()
+    return {form.perf_type: form_state(form) for form in forms}
+
+
+def run_case(session: Session, rng: random.Random, user_id: int, max_games: int, shuffled: bool) -> tuple[dict, dict]:
+    session.add(User(id=user_id, lichess_id=f"user{user_id}", username=f"user{user_id}"))
+    session.commit()
+
+    games = sorted(
+        random_games(rng, user_id, rng.randint(1, max_games)),
+        key=lambda game: (game["created_at"], game["id"])
+    )
+
+    # an archived prefix without form rows exercises the rebuild over both tiers
+    archived = rng.randint(0, len(games) // 2)
+    if archived:
+        session.bulk_insert_mappings(GameArchive, games[:archived])
+        session.commit()
+
+    # mirrors insert_batch: participant rows first, then the form, then commit
+    for batch in random_batches(rng, games[archived:], shuffled):
+        session.bulk_insert_mappings(Game, batch)
+        update_game_form(session, batch)
+        session.commit()
+
+    session.expire_all()
+    return stored_forms(session, user_id), expected_forms(games)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--max-games", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # SQLite keeps the check self-contained; the form code paths only use portable SQL
+    engine = create_engine("sqlite://")
+    for table in FORM_TABLES:
+        table.create(engine)
+
+    rng = random.Random(args.seed)
+    with Session(engine) as session:
+        for case in range(args.cases):
+            shuffled = case % 4 == 0
+            stored, expected = run_case(session, rng, case + 1, args.max_games, shuffled)
+
+            if stored != expected:
+                print(f"case {case} (seed {args.seed}, shuffled={shuffled}) diverged")
+                print(f"  stored:   {stored}")
+                print(f"  expected: {expected}")
+                sys.exit(1)
+
+    print(f"{args.cases} cases consistent")
+
+
+if __name__ == "__main__":
+    main()
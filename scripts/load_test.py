@@ -0,0 +1,277 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import httpx
+
+from scripts.benchmark_games_table import summarize
+from scripts.seed import clear_seed, seed_games
+
+
+class LichessStubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        body = json.dumps({
+            "id": token,
+            "username": token,
+            "url": f"https://lichess.org/@/{token}",
+            "createdAt": 1500000000000,
+            "seenAt": 1700000000000,
+            "perfs": {
+                "blitz": {"rating": 1850, "games": 1200, "rd": 45, "prog": 12},
+                "rapid": {"rating": 1920, "games": 300, "rd": 60, "prog": -4},
+            },
+            "count": {"all": 1500},
+        }).encode()
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_lichess_stub(latency_ms: float) -> ThreadingHTTPServer:
+    LichessStubHandler.latency = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LichessStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_scenarios(deep_page: int, limit: int) -> dict[str, tuple[str, dict]]:
+    return {
+        "games_shallow": ("/api/games", {"page": 1, "limit": limit}),
+        "games_deep": ("/api/games", {"page": deep_page, "limit": limit}),
+        "games_filtered": ("/api/games", {"page": 1, "limit": limit, "perf_type": "blitz"}),
+        "profile": ("/api/profile", {}),
+        "sync_status": ("/api/games/sync/status/{task_id}", {}),
+    }
+
+
+async def simulate_syncs(task_ids: list[str], interval: float, stop: asyncio.Event):
+    from src.cache import get_redis
+    from src.games.sync_engine import ProgressReporter
+    
+    redis = await get_redis()
+    reporters = [ProgressReporter(redis, task_id) for task_id in task_ids]
+    current = 0
+    while not stop.is_set():
+        current += 1
+        # the same result-backend writes and pub/sub events running workers produce
+        await asyncio.gather(*(
+            reporter.update(current, 10000, f"Processed {current} games...", force=True)
+            for reporter in reporters
+        ))
+        await asyncio.sleep(interval)
+
+
+async def measure_loop_lag(samples: list[float], stop: asyncio.Event, interval: float = 0.005):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(time.perf_counter() - start - interval, 0.0))
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    path: str,
+    params: dict,
+    tokens: list[str],
+    requests: int,
+    concurrency: int,
+    task_ids: list[str] | None = None
+) -> dict:
+    samples = []
+    statuses = {}
+    cache_hits = 0
+    counter = iter(range(requests))
+    
+    async def worker():
+        nonlocal cache_hits
+        for index in counter:
+            start = time.perf_counter()
+            response = await client.get(
+                path.format(task_id=task_ids[index % len(task_ids)]) if task_ids else path,
+                params=params,
+                cookies={"access_token": tokens[index % len(tokens)]}
+            )
+            samples.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.headers.get("X-Cache-Status") == "HIT":
+                cache_hits += 1
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    
+    report = {
+        "requests": requests,
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency": summarize(samples),
+    }
+    if path == "/api/profile":
+        report["cache_hit_ratio"] = round(cache_hits / requests, 3)
+    return report
+
+
+async def run_load(args, user_ids: list[int]) -> dict:
+    from src.main import app
+    from src.auth.dependencies import create_access_token
+    from src.cache import close_redis, get_redis
+    
+    tokens = [create_access_token({"user_id": user_id}) for user_id in user_ids]
+    redis = await get_redis()
+    
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        for name, (path, params) in build_scenarios(args.deep_page, args.limit).items():
+            if args.scenarios and name not in args.scenarios:
+                continue
+            if name == "profile" and args.cold_profile_cache:
+                await redis.delete(*[f"profile:{user_id}" for user_id in user_ids])
+            
+            if name == "sync_status":
+                results[name] = await run_status_scenario(client, path, tokens, args)
+                continue
+            
+            await run_scenario(client, path, params, tokens, args.warmup, args.concurrency)
+            results[name] = await run_scenario(
+                client,
+                path,
+                params,
+                tokens,
+                args.requests,
+                args.concurrency
+            )
+    
+    await close_redis()
+    return results
+
+
+async def run_status_scenario(client: httpx.AsyncClient, path: str, tokens: list[str], args) -> dict:
+    from src.celery_app import celery_app
+    from src.cache import get_redis
+    
+    task_ids = [f"loadtest-{index}" for index in range(args.syncs)]
+    stop = asyncio.Event()
+    lag_samples = []
+    background = [
+        asyncio.create_task(simulate_syncs(task_ids, args.sync_progress_interval, stop)),
+        asyncio.create_task(measure_loop_lag(lag_samples, stop)),
+    ]
+    
+    try:
+        await run_scenario(client, path, {}, tokens, args.warmup, args.concurrency, task_ids)
+        lag_samples.clear()
+        report = await run_scenario(
+            client,
+            path,
+            {},
+            tokens,
+            args.requests,
+            args.concurrency,
+            task_ids
+        )
+    finally:
+        stop.set()
+        await asyncio.gather(*background)
+        redis = await get_redis()
+        await redis.delete(*[
+            celery_app.backend.get_key_for_task(task_id).decode()
+            for task_id in task_ids
+        ])
+    
+    report["syncs_simulated"] = args.syncs
+    report["event_loop_lag"] = summarize(lag_samples) if lag_samples else None
+    return report
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the games and profile endpoints")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--games-per-user", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--deep-page", type=int, default=50)
+    parser.add_argument("--scenarios", nargs="+", default=None)
+    parser.add_argument("--upstream-latency-ms", type=float, default=150)
+    parser.add_argument("--cold-profile-cache", action="store_true")
+    parser.add_argument("--syncs", type=int, default=20)
+    parser.add_argument("--sync-progress-interval", type=float, default=0.05)
+    parser.add_argument("--keep-seed", action="store_true")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    
+    from src.games.tasks import get_session
+    
+    stub = start_lichess_stub(args.upstream_latency_ms)
+    stub_url = f"http://127.0.0.1:{stub.server_address[1]}/api/account"
+    
+    with get_session() as session:
+        clear_seed(session)
+        user_ids = seed_games(session, args.users, args.games_per_user)
+    
+    try:
+        with mock.patch("src.profile.service.LICHESS_ACCOUNT_URL", stub_url):
+            results = asyncio.run(run_load(args, user_ids))
+    finally:
+        stub.shutdown()
+        if not args.keep_seed:
+            with get_session() as session:
+                clear_seed(session)
+    
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "config": {
+            "users": args.users,
+            "games_per_user": args.games_per_user,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "limit": args.limit,
+            "deep_page": args.deep_page,
+            "upstream_latency_ms": args.upstream_latency_ms,
+            "cold_profile_cache": args.cold_profile_cache,
+            "syncs": args.syncs,
+            "sync_progress_interval": args.sync_progress_interval,
+        },
+        "scenarios": results,
+    }
+    
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
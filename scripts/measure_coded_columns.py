@@ -0,0 +1,102 @@
+import argparse
+import json
+
+from sqlalchemy import select, text
+
+from src.auth.models import User
+from src.games.constants import PERF_TYPES, RESULTS, TERMINATIONS, USER_COLORS
+from scripts.seed import SEED_PREFIX, clear_seed, seed_games
+
+COMMON_COLUMNS = "g.user_id, g.id, g.created_at, g.opponent_name, g.opponent_rating, g.imported_at"
+
+CODED_COLUMNS = {
+    "g.perf_type": (50, PERF_TYPES),
+    "g.user_color": (10, USER_COLORS),
+    "g.result": (10, RESULTS),
+    "l.termination": (50, TERMINATIONS),
+}
+
+
+def as_string(column: str, length: int, values: tuple[str, ...]) -> str:
+    cases = " ".join(f"WHEN {code} THEN '{value}'" for code, value in enumerate(values))
+    return f"(CASE {column} {cases} END)::varchar({length}) AS {column.split('.')[1]}"
+
+
+def measure(session, table: str) -> dict:
+    # the same (user_id, perf_type) index that backs perf-filtered game lists
+    session.execute(text(f"CREATE INDEX {table}_user_perf ON {table} (user_id, perf_type)"))
+    session.execute(text(f"ANALYZE {table}"))
+    heap_bytes, index_bytes, rows, avg_row_bytes = session.execute(text(
+        f"SELECT pg_relation_size('{table}'), pg_indexes_size('{table}'), "
+        f"count(*), avg(pg_column_size(t.*)) FROM {table} t"
+    )).one()
+    return {
+        "rows": rows,
+        "heap_bytes": heap_bytes,
+        "index_bytes": index_bytes,
+        "avg_row_bytes": round(float(avg_row_bytes), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare games row size with coded and string enum columns")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--games-per-user", type=int, default=5000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    
+    from src.games.tasks import get_session
+    
+    with get_session() as session:
+        clear_seed(session)
+        seed_games(session, args.users, args.games_per_user)
+        
+        # both copies hold the same rows and the same other columns, so the
+        # difference is only the enum encoding and the dropped url column
+        source = (
+            "FROM games g JOIN lichess_games l ON l.id = g.id "
+            "WHERE g.user_id IN (SELECT id FROM users WHERE lichess_id LIKE :prefix)"
+        )
+        params = {"prefix": f"{SEED_PREFIX}%"}
+        session.execute(text(
+            f"CREATE TEMP TABLE games_coded AS SELECT {COMMON_COLUMNS}, "
+            f"{', '.join(CODED_COLUMNS)} {source}"
+        ), params)
+        session.execute(text(
+            f"CREATE TEMP TABLE games_strings AS SELECT {COMMON_COLUMNS}, "
+            + ", ".join(
+                as_string(column, length, values)
+                for column, (length, values) in CODED_COLUMNS.items()
+            )
+            + f", ('https://lichess.org/' || g.id)::varchar(512) AS url {source}"
+        ), params)
+        
+        report = {
+            "users": len(session.execute(
+                select(User.id).where(User.lichess_id.startswith(SEED_PREFIX))
+            ).all()),
+            "strings": measure(session, "games_strings"),
+            "coded": measure(session, "games_coded"),
+        }
+        report["saved_bytes_per_row"] = round(
+            report["strings"]["avg_row_bytes"] - report["coded"]["avg_row_bytes"], 1
+        )
+        report["heap_ratio"] = round(
+            report["coded"]["heap_bytes"] / report["strings"]["heap_bytes"], 3
+        )
+        report["index_ratio"] = round(
+            report["coded"]["index_bytes"] / report["strings"]["index_bytes"], 3
+        )
+        
+        session.rollback()
+        clear_seed(session)
+    
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import random
+import string
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from src.auth.models import OAuthToken, User
+from src.games.models import Game, LichessGame
+
+SEED_PREFIX = "seed_"
+
+PERF_TYPES = ["bullet", "blitz", "rapid", "classical", "correspondence"]
+TIME_CONTROLS = {
+    "bullet": "1+0",
+    "blitz": "3+2",
+    "rapid": "10+0",
+    "classical": "30+20",
+    "correspondence": "3 days/move",
+}
+TERMINATIONS = ["checkmate", "resignation", "time", "draw", "stalemate"]
+
+
+def random_game_id(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_letters + string.digits, k=8))
+
+
+def seed_games(
+    session: Session,
+    users: int,
+    games_per_user: int,
+    batch_size: int = 5000,
+    rng_seed: int = 42
+) -> list[int]:
+    rng = random.Random(rng_seed)
+    user_ids = []
+    
+    for index in range(users):
+        user = User(
+            lichess_id=f"{SEED_PREFIX}{index}",
+            username=f"{SEED_PREFIX}{index}",
+            profile_data={"count": {"all": games_per_user}},
+            last_login_at=datetime.utcnow(),
+        )
+        session.add(user)
+        session.flush()
+        session.add(OAuthToken(user_id=user.id, access_token=f"{SEED_PREFIX}token_{index}"))
+        user_ids.append(user.id)
+        
+        start = datetime.utcnow() - timedelta(days=3 * 365)
+        details = []
+        games = []
+        for game_index in range(games_per_user):
+            perf_type = rng.choice(PERF_TYPES)
+            game_id = random_game_id(rng)
+            details.append({
+                "id": game_id,
+                "time_control": TIME_CONTROLS[perf_type],
+                "termination": rng.choice(TERMINATIONS),
+            })
+            games.append({
+                "id": game_id,
+                "user_id": user.id,
+                "created_at": start + timedelta(minutes=game_index * 15),
+                "perf_type": perf_type,
+                "opponent_name": f"opponent_{rng.randrange(games_per_user // 10 + 1)}",
+                "opponent_rating": rng.randint(800, 2800),
+                "user_color": rng.choice(["white", "black"]),
+                "result": rng.choice(["win", "loss", "draw"]),
+                "imported_at": datetime.utcnow(),
+            })
+            
+            if len(games) >= batch_size:
+                session.bulk_insert_mappings(LichessGame, details)
+                session.bulk_insert_mappings(Game, games)
+                details = []
+                games = []
+        
+        if games:
+            session.bulk_insert_mappings(LichessGame, details)
+            session.bulk_insert_mappings(Game, games)
+        session.commit()
+    
+    return user_ids
+
+
+def clear_seed(session: Session):
+    seed_users = select(User.id).where(User.lichess_id.startswith(SEED_PREFIX))
+    session.execute(delete(LichessGame).where(
+        LichessGame.id.in_(select(Game.id).where(Game.user_id.in_(seed_users)))
+    ))
+    session.execute(delete(Game).where(Game.user_id.in_(seed_users)))
+    session.execute(delete(OAuthToken).where(OAuthToken.user_id.in_(seed_users)))
+    session.execute(delete(User).where(User.lichess_id.startswith(SEED_PREFIX)))
+    session.commit()
+
+
+if __name__ == "__main__":
+    from src.games.tasks import get_session
+    
+    parser = argparse.ArgumentParser(description="Seed synthetic users and games")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--games-per-user", type=int, default=1000)
+    parser.add_argument("--clear", action="store_true", help="remove seeded data and exit")
+    args = parser.parse_args()
+    
+    with get_session() as session:
+        clear_seed(session)
+        if not args.clear:
+            user_ids = seed_games(session, args.users, args.games_per_user)
+            print(f"Seeded {len(user_ids)} users with {args.games_per_user} games each")
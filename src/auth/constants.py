@@ -1,5 +1,6 @@
 LICHESS_OAUTH_URL = "https://lichess.org/oauth"
 LICHESS_TOKEN_URL = "https://lichess.org/api/token"
 LICHESS_ACCOUNT_URL = "https://lichess.org/api/account"
+LICHESS_USERS_URL = "https://lichess.org/api/users"
 
 OAUTH_SCOPES = "email:read preference:read"
@@ -1,13 +1,14 @@
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
+from jose import jwt
 from fastapi import Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from src.config import settings
-from src.database import get_db
+from src.database import get_read_db
 from src.auth.models import User
+from src.auth.utils import get_token_user_id
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -24,7 +25,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 async def get_current_user(
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -32,16 +33,8 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token = request.cookies.get("access_token")
-    if not token:
-        raise credentials_exception
-    
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-        user_id: int = payload.get("user_id")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+    user_id = get_token_user_id(request)
+    if user_id is None:
         raise credentials_exception
     
     result = await db.execute(select(User).where(User.id == user_id))
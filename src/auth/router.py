@@ -13,6 +13,8 @@ from src.auth.utils import create_verifier, create_challenge, create_state
 from src.auth.models import User, OAuthToken
 from src.auth.dependencies import create_access_token, get_current_user
 from src.auth.schemas import UserResponse
+from src.metrics import observe_lichess_response
+from src.cache import mark_primary_sticky
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -96,6 +98,7 @@ async def callback(
                 "code_verifier": code_verifier,
             },
         )
+        observe_lichess_response("token", token_response)
         token_data = token_response.json()
 
     if "access_token" not in token_data:
@@ -106,6 +109,7 @@ async def callback(
             LICHESS_ACCOUNT_URL,
             headers={"Authorization": f"Bearer {token_data['access_token']}"},
         )
+        observe_lichess_response("account", user_response)
         user_data = user_response.json()
 
     lichess_id = user_data.get("id")
@@ -119,6 +123,7 @@ async def callback(
             lichess_id=lichess_id,
             username=username,
             profile_data=user_data,
+            last_login_at=datetime.utcnow(),
         )
         db.add(user)
         await db.commit()
@@ -126,6 +131,7 @@ async def callback(
     else:
         user.username = username
         user.profile_data = user_data
+        user.last_login_at = datetime.utcnow()
         await db.commit()
         await db.refresh(user)
 
@@ -146,6 +152,7 @@ async def callback(
         db.add(oauth_token)
         await db.commit()
 
+    await mark_primary_sticky(user.id)
     jwt_token = create_access_token({"user_id": user.id})
     
     response = RedirectResponse(url=settings.frontend_url, status_code=302)
@@ -1,6 +1,11 @@
 import secrets
 import hashlib
 import base64
+from typing import Optional
+from fastapi import Request
+from jose import JWTError, jwt
+
+from src.config import settings
 
 
 def create_verifier() -> str:
@@ -14,3 +19,16 @@ def create_challenge(verifier: str) -> str:
 
 def create_state() -> str:
     return secrets.token_urlsafe(32)
+
+
+def get_token_user_id(request: Request) -> Optional[int]:
+    token = request.cookies.get("access_token")
+    if not token:
+        return None
+    
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    except JWTError:
+        return None
+    
+    return payload.get("user_id")
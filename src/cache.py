@@ -1,10 +1,62 @@
 import json
 from typing import Optional
+from uuid import uuid4
 from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
 
 from src.config import settings
+from src.metrics import observe_cache
 
 redis_client: Optional[Redis] = None
+rate_limit_script: Optional[AsyncScript] = None
+
+PROFILE_WRITES_KEY = "profile_writes"
+PROFILE_WRITES_SCHEDULED_KEY = "profile_writes:scheduled"
+PROFILE_WRITES_PROCESSING_KEY = "profile_writes:processing"
+OPPONENT_CACHE_PREFIX = "opponent:"
+PRIMARY_STICKY_PREFIX = "primary_sticky:"
+SYNC_LOCK_PREFIX = "sync_lock:"
+AUTO_SYNC_SLOTS_KEY = "auto_sync:slots"
+SYNC_PROGRESS_CHANNEL_PREFIX = "sync_progress:"
+TIME_USAGE_CACHE_PREFIX = "time_usage:"
+SYNC_ENGINE_JOBS_KEY = "sync_engine:jobs"
+SYNC_ENGINE_PROCESSING_PREFIX = "sync_engine:processing:"
+SYNC_ENGINE_HEARTBEAT_PREFIX = "sync_engine:heartbeat:"
+SYNCS_IN_FLIGHT_KEY = "syncs:in_flight"
+WORKER_POOLS_KEY = "capacity:worker_pools"
+RATE_LIMIT_PREFIX = "rate_limit:"
+DATA_VERSION_PREFIX = "data_version:"
+
+# sliding-window log per key: the request is admitted only if every key has room,
+# and then recorded in all of them; returns 0 or the milliseconds until a slot frees
+RATE_LIMIT_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local window = tonumber(ARGV[1])
+local retry_after = 0
+
+for index, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now_ms - window)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[index + 2]) then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        local wait = window
+        if oldest[2] then
+            wait = tonumber(oldest[2]) + window - now_ms
+        end
+        retry_after = math.max(retry_after, wait)
+    end
+end
+
+if retry_after > 0 then
+    return retry_after
+end
+
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now_ms, ARGV[2])
+    redis.call('PEXPIRE', key, window)
+end
+return 0
+"""
 
 
 async def get_redis() -> Redis:
@@ -19,27 +71,135 @@ async def get_redis() -> Redis:
 
 
 async def close_redis():
-    global redis_client
+    global redis_client, rate_limit_script
     if redis_client:
         await redis_client.close()
         redis_client = None
+        rate_limit_script = None
 
 
-async def get_profile_cache(user_id: int) -> Optional[dict]:
+async def hit_rate_limit(limits: dict[str, int], window: int) -> int:
+    global rate_limit_script
+    redis = await get_redis()
+    if rate_limit_script is None:
+        rate_limit_script = redis.register_script(RATE_LIMIT_SCRIPT)
+    
+    keys = [f"{RATE_LIMIT_PREFIX}{key}" for key in limits]
+    return await rate_limit_script(
+        keys=keys,
+        args=[window * 1000, uuid4().hex, *limits.values()]
+    )
+
+
+async def get_profile_cache(user_id: int) -> Optional[str]:
     redis = await get_redis()
     cache_key = f"profile:{user_id}"
     cached_data = await redis.get(cache_key)
+    observe_cache("profile", cached_data is not None)
+    
+    return cached_data
+
+
+async def set_profile_cache(user_id: int, profile_data: dict, ttl: int = 3600) -> str:
+    redis = await get_redis()
+    cache_key = f"profile:{user_id}"
+    payload = json.dumps(profile_data)
+    await redis.setex(cache_key, ttl, payload)
+    return payload
+
+
+async def get_data_version(user_id: int) -> str:
+    redis = await get_redis()
+    version_key = f"{DATA_VERSION_PREFIX}{user_id}"
+    
+    version = await redis.get(version_key)
+    if version is None:
+        # a fresh token rather than 0, so ETags issued before a Redis flush never match again
+        version = uuid4().hex
+        if not await redis.set(version_key, version, nx=True):
+            version = await redis.get(version_key)
+    
+    return version
+
+
+async def mark_primary_sticky(user_id: int):
+    if not settings.database_replica_url:
+        return
+    
+    redis = await get_redis()
+    await redis.setex(
+        f"{PRIMARY_STICKY_PREFIX}{user_id}",
+        settings.read_your_writes_window,
+        "1"
+    )
+
+
+async def is_primary_sticky(user_id: int) -> bool:
+    redis = await get_redis()
+    return bool(await redis.exists(f"{PRIMARY_STICKY_PREFIX}{user_id}"))
+
+
+async def claim_sync_lock(user_id: int, task_id: str, ttl: int) -> Optional[str]:
+    redis = await get_redis()
+    lock_key = f"{SYNC_LOCK_PREFIX}{user_id}"
+    if await redis.set(lock_key, task_id, nx=True, ex=ttl):
+        return None
+    return await redis.get(lock_key)
+
+
+async def get_time_usage_cache(user_id: int, perf_type: str) -> Optional[dict]:
+    redis = await get_redis()
+    cached_data = await redis.hget(f"{TIME_USAGE_CACHE_PREFIX}{user_id}", perf_type)
+    observe_cache("time_usage", cached_data is not None)
     
     if cached_data:
         return json.loads(cached_data)
     return None
 
 
-async def set_profile_cache(user_id: int, profile_data: dict, ttl: int = 3600):
+async def set_time_usage_cache(user_id: int, perf_type: str, time_usage: dict):
     redis = await get_redis()
-    cache_key = f"profile:{user_id}"
-    await redis.setex(
-        cache_key,
-        ttl,
-        json.dumps(profile_data)
+    cache_key = f"{TIME_USAGE_CACHE_PREFIX}{user_id}"
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hset(cache_key, perf_type, json.dumps(time_usage))
+        pipe.expire(cache_key, settings.time_usage_cache_ttl)
+        await pipe.execute()
+
+
+async def enqueue_sync_engine_job(job: dict):
+    redis = await get_redis()
+    await redis.rpush(SYNC_ENGINE_JOBS_KEY, json.dumps(job))
+
+
+async def queue_profile_write(user_id: int, profile_data: dict) -> bool:
+    redis = await get_redis()
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hset(PROFILE_WRITES_KEY, str(user_id), json.dumps(profile_data))
+        pipe.set(
+            PROFILE_WRITES_SCHEDULED_KEY,
+            "1",
+            nx=True,
+            ex=settings.profile_write_flush_delay
+        )
+        _, scheduled = await pipe.execute()
+    return bool(scheduled)
+
+
+async def get_opponents_cache(opponent_names: list[str]) -> dict[str, dict]:
+    opponent_ids = list({name.lower() for name in opponent_names if name})
+    if not opponent_ids:
+        return {}
+    
+    redis = await get_redis()
+    cached_data = await redis.mget(
+        [f"{OPPONENT_CACHE_PREFIX}{opponent_id}" for opponent_id in opponent_ids]
     )
+    hits = sum(1 for data in cached_data if data)
+    observe_cache("opponent", True, hits)
+    observe_cache("opponent", False, len(opponent_ids) - hits)
+    
+    return {
+        opponent_id: json.loads(data)
+        for opponent_id, data in zip(opponent_ids, cached_data)
+        if data
+    }
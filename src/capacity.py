@@ -0,0 +1,132 @@
+import asyncio
+import json
+import secrets
+import time
+from typing import Optional
+from fastapi import HTTPException, Request, status
+
+from src.config import settings
+from src.cache import (
+    SYNC_ENGINE_JOBS_KEY,
+    SYNCS_IN_FLIGHT_KEY,
+    WORKER_POOLS_KEY,
+    get_redis,
+)
+from src.metrics import pool_usage
+from src.database import get_engine, get_replica_engine
+from src.auth.router import oauth_sessions
+from src.games.constants import SYNC_QUEUE_BULK, SYNC_QUEUE_INCREMENTAL
+
+CELERY_QUEUES = ("celery", SYNC_QUEUE_INCREMENTAL, SYNC_QUEUE_BULK)
+
+# kombu keeps one Redis list per priority step when queue_order_strategy is "priority"
+PRIORITY_STEPS = (0, 3, 6, 9)
+PRIORITY_SEPARATOR = "\x06\x16"
+
+capacity_snapshot: Optional[dict] = None
+capacity_snapshot_at = 0.0
+capacity_lock = asyncio.Lock()
+
+
+def priority_queue_keys(queue: str) -> list[str]:
+    return [
+        queue if step == 0 else f"{queue}{PRIORITY_SEPARATOR}{step}"
+        for step in PRIORITY_STEPS
+    ]
+
+
+def redis_pool_usage(pool) -> dict:
+    # redis-py keeps no public counters, so report None rather than break on an upgrade
+    in_use = getattr(pool, "_in_use_connections", None)
+    available = getattr(pool, "_available_connections", None)
+    return {
+        "max_connections": pool.max_connections,
+        "in_use": len(in_use) if in_use is not None else None,
+        "available": len(available) if available is not None else None,
+    }
+
+
+def require_capacity_token(request: Request):
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(),
+        settings.capacity_token.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+def summarize_worker_pools(raw_pools: dict[str, str], now: float) -> tuple[dict, list[str]]:
+    pools = {}
+    stale = []
+    for worker, raw in raw_pools.items():
+        report = json.loads(raw)
+        if now - report["updated_at"] > settings.capacity_worker_stale_after:
+            stale.append(worker)
+            continue
+        
+        summary = pools.setdefault(
+            report["engine"],
+            {"workers": 0, "size": 0, "checked_out": 0, "overflow": 0}
+        )
+        summary["workers"] += 1
+        for field in ("size", "checked_out", "overflow"):
+            summary[field] += report[field]
+    return pools, stale
+
+
+async def collect_capacity() -> dict:
+    now = time.time()
+    redis = await get_redis()
+    
+    async with redis.pipeline(transaction=False) as pipe:
+        for queue in CELERY_QUEUES:
+            for key in priority_queue_keys(queue):
+                pipe.llen(key)
+        pipe.llen(SYNC_ENGINE_JOBS_KEY)
+        pipe.zremrangebyscore(SYNCS_IN_FLIGHT_KEY, "-inf", now - settings.task_time_limit)
+        pipe.zcard(SYNCS_IN_FLIGHT_KEY)
+        pipe.zrange(SYNCS_IN_FLIGHT_KEY, 0, 0, withscores=True)
+        pipe.hgetall(WORKER_POOLS_KEY)
+        results = await pipe.execute()
+    
+    steps = len(PRIORITY_STEPS)
+    queues = {
+        queue: sum(results[index * steps:(index + 1) * steps])
+        for index, queue in enumerate(CELERY_QUEUES)
+    }
+    offset = len(CELERY_QUEUES) * steps
+    queues["sync_engine"] = results[offset]
+    _, active_syncs, oldest, raw_pools = results[offset + 1:]
+    
+    db_pools, stale_workers = summarize_worker_pools(raw_pools, now)
+    if stale_workers:
+        await redis.hdel(WORKER_POOLS_KEY, *stale_workers)
+    
+    db_pools["async"] = pool_usage(get_engine().sync_engine.pool)
+    if get_replica_engine() is not get_engine():
+        db_pools["async_replica"] = pool_usage(get_replica_engine().sync_engine.pool)
+    
+    return {
+        "generated_at": now,
+        "db_pools": db_pools,
+        "redis_pool": redis_pool_usage(redis.connection_pool),
+        "queues": queues,
+        "active_syncs": active_syncs,
+        "oldest_sync": {
+            "task_id": oldest[0][0],
+            "running_seconds": round(now - oldest[0][1], 1),
+        } if oldest else None,
+        "oauth_sessions": len(oauth_sessions),
+    }
+
+
+async def get_capacity() -> dict:
+    global capacity_snapshot, capacity_snapshot_at
+    async with capacity_lock:
+        if (
+            capacity_snapshot is None
+            or time.monotonic() - capacity_snapshot_at >= settings.capacity_cache_ttl
+        ):
+            capacity_snapshot = await collect_capacity()
+            capacity_snapshot_at = time.monotonic()
+        return capacity_snapshot
@@ -1,11 +1,14 @@
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
+from prometheus_client import CollectorRegistry, multiprocess, start_http_server
+
 from src.config import settings
 
 celery_app = Celery(
     "lichess_stats",
     broker=settings.redis_url,
     backend=settings.redis_url,
-    include=["src.games.tasks"]
+    include=["src.games.tasks", "src.profile.tasks"]
 )
 
 celery_app.conf.update(
@@ -15,6 +18,36 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
-    task_time_limit=30 * 60,
-    task_soft_time_limit=25 * 60,
+    task_time_limit=settings.task_time_limit,
+    task_soft_time_limit=settings.task_soft_time_limit,
+    task_default_queue="celery",
+    broker_transport_options={"queue_order_strategy": "priority"},
+    beat_schedule={
+        "schedule-auto-syncs": {
+            "task": "schedule_auto_syncs",
+            "schedule": settings.auto_sync_interval,
+        },
+    },
 )
+
+if settings.archive_after_days:
+    celery_app.conf.beat_schedule["archive-old-games"] = {
+        "task": "archive_old_games",
+        "schedule": settings.archive_interval,
+    }
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    if not settings.worker_metrics_port:
+        return
+    
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    start_http_server(settings.worker_metrics_port, registry=registry)
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    if settings.worker_metrics_port:
+        multiprocess.mark_process_dead(pid)
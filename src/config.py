@@ -10,6 +10,14 @@ class Settings(BaseSettings):
     )
 
     database_url: str
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+
+    database_replica_url: str | None = None
+    database_replica_pool_size: int = 5
+    database_replica_max_overflow: int = 10
+    read_your_writes_window: int = 10
+
     redis_url: str
 
     lichess_client_id: str
@@ -19,6 +27,50 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24 * 7
 
+    task_time_limit: int = 30 * 60
+    task_soft_time_limit: int = 25 * 60
+
+    profile_write_flush_delay: int = 5
+    profile_write_batch_size: int = 500
+
+    opponent_cache_ttl: int = 60 * 60 * 24
+
+    db_profiling_enabled: bool = False
+    db_slow_request_ms: int = 200
+
+    worker_metrics_port: int | None = None
+
+    bulk_sync_threshold: int = 2000
+
+    auto_sync_interval: int = 60 * 60
+    auto_sync_active_days: int = 7
+    auto_sync_max_concurrency: int = 4
+    auto_sync_jitter: int = 60
+    auto_sync_retry_delay: int = 60
+
+    sync_progress_min_interval: float = 1.0
+    sync_engine: str = "celery"
+    sync_engine_concurrency: int = 50
+    sync_engine_db_concurrency: int = 5
+    sync_engine_heartbeat_ttl: int = 30
+    sync_stream_heartbeat: int = 15
+
+    time_usage_cache_ttl: int = 60 * 60 * 24
+
+    sync_rate_limit_per_user: int = 5
+    sync_rate_limit_per_ip: int = 20
+    sync_rate_limit_window: int = 60
+    profile_rate_limit_per_user: int = 30
+    profile_rate_limit_per_ip: int = 120
+    profile_rate_limit_window: int = 60
+
+    archive_after_days: int | None = None
+    archive_batch_size: int = 5000
+    archive_interval: int = 60 * 60 * 24
+
+    capacity_token: str | None = None
+    capacity_cache_ttl: float = 1.0
+    capacity_worker_stale_after: int = 60
 
     frontend_url: str
     environment: str = "development"
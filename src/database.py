@@ -1,12 +1,28 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from typing import Optional
+from fastapi import Request
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from src.config import settings
+from src.cache import is_primary_sticky
+from src.metrics import register_pool_gauges
+from src.profiling import install_query_profiling
+from src.auth.utils import get_token_user_id
 
-engine = create_async_engine(settings.database_url, echo=settings.is_development)
+engine: Optional[AsyncEngine] = None
+replica_engine: Optional[AsyncEngine] = None
 
 AsyncSessionLocal = async_sessionmaker(
-    engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+ReplicaSessionLocal = async_sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False,
 )
@@ -16,6 +32,54 @@ class Base(DeclarativeBase):
     pass
 
 
+def get_engine() -> AsyncEngine:
+    global engine
+    if engine is None:
+        engine = create_async_engine(
+            settings.database_url,
+            echo=settings.is_development,
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+        )
+        register_pool_gauges("async", engine.sync_engine.pool)
+        if settings.db_profiling_enabled:
+            install_query_profiling(engine.sync_engine)
+        AsyncSessionLocal.configure(bind=engine)
+    return engine
+
+
+def get_replica_engine() -> AsyncEngine:
+    global replica_engine
+    if replica_engine is None:
+        if settings.database_replica_url:
+            replica_engine = create_async_engine(
+                settings.database_replica_url,
+                echo=settings.is_development,
+                pool_size=settings.database_replica_pool_size,
+                max_overflow=settings.database_replica_max_overflow,
+            )
+            register_pool_gauges("async_replica", replica_engine.sync_engine.pool)
+            if settings.db_profiling_enabled:
+                install_query_profiling(replica_engine.sync_engine)
+        else:
+            replica_engine = get_engine()
+        ReplicaSessionLocal.configure(bind=replica_engine)
+    return replica_engine
+
+
 async def get_db() -> AsyncSession:
+    get_engine()
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db(request: Request) -> AsyncSession:
+    session_factory = ReplicaSessionLocal
+    
+    if get_replica_engine() is not get_engine():
+        user_id = get_token_user_id(request)
+        if user_id is not None and await is_primary_sticky(user_id):
+            session_factory = AsyncSessionLocal
+    
+    async with session_factory() as session:
+        yield session
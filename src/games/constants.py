@@ -0,0 +1,47 @@
+SYNC_QUEUE_BULK = "bulk"
+SYNC_QUEUE_INCREMENTAL = "incremental"
+
+SYNC_TERMINAL_STATES = {"SUCCESS", "FAILURE", "REVOKED"}
+
+TIME_USAGE_MAX_MOVES = 80
+TIME_TROUBLE_FRACTION = 0.1
+TIME_TROUBLE_MIN_CENTISECONDS = 10 * 100
+
+LICHESS_GAME_URL = "https://lichess.org/{game_id}"
+
+FORM_WINDOW_DAYS = 30
+PERFORMANCE_RATING_SPREAD = 400
+
+# Stored as smallint codes by position: only ever append to these tuples.
+PERF_TYPES = (
+    "ultraBullet",
+    "bullet",
+    "blitz",
+    "rapid",
+    "classical",
+    "correspondence",
+    "chess960",
+    "crazyhouse",
+    "antichess",
+    "atomic",
+    "horde",
+    "kingOfTheHill",
+    "racingKings",
+    "threeCheck",
+    "fromPosition",
+)
+USER_COLORS = ("white", "black")
+RESULTS = ("win", "loss", "draw")
+TERMINATIONS = (
+    "normal",
+    "checkmate",
+    "resignation",
+    "time",
+    "timeout",
+    "draw",
+    "stalemate",
+    "cheat",
+    "abandoned",
+    "unknown",
+    "variant_end",
+)
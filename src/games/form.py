@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+from src.games.constants import FORM_WINDOW_DAYS, PERFORMANCE_RATING_SPREAD
+
+# daily bucket layout: games, doubled points, rated games, opponent rating sum,
+# wins minus losses against rated opponents
+GAMES, POINTS, RATED_GAMES, RATING_SUM, RATED_BALANCE = range(5)
+
+RESULT_POINTS = {"win": 2, "draw": 1, "loss": 0}
+RESULT_BALANCE = {"win": 1, "draw": 0, "loss": -1}
+
+
+def empty_form() -> dict:
+    return {
+        "current_streak": 0,
+        "longest_win_streak": 0,
+        "longest_loss_streak": 0,
+        "last_game_at": None,
+        "daily": {},
+    }
+
+
+def game_order(game: dict) -> tuple:
+    return game["created_at"], game["id"]
+
+
+def is_in_order(state: dict, games: list[dict]) -> bool:
+    return state["last_game_at"] is None or min(
+        game["created_at"] for game in games
+    ) > state["last_game_at"]
+
+
+def apply_games(state: dict, games: list[dict]) -> dict:
+    streak = state["current_streak"]
+    longest_win = state["longest_win_streak"]
+    longest_loss = state["longest_loss_streak"]
+    last_game_at = state["last_game_at"]
+    daily = {day: list(bucket) for day, bucket in state["daily"].items()}
+    
+    for game in sorted(games, key=game_order):
+        result = game["result"]
+        if result == "win":
+            streak = streak + 1 if streak > 0 else 1
+            longest_win = max(longest_win, streak)
+        elif result == "loss":
+            streak = streak - 1 if streak < 0 else -1
+            longest_loss = max(longest_loss, -streak)
+        else:
+            streak = 0
+        
+        bucket = daily.setdefault(game["created_at"].date().isoformat(), [0, 0, 0, 0, 0])
+        bucket[GAMES] += 1
+        bucket[POINTS] += RESULT_POINTS.get(result, 0)
+        if game["opponent_rating"]:
+            bucket[RATED_GAMES] += 1
+            bucket[RATING_SUM] += game["opponent_rating"]
+            bucket[RATED_BALANCE] += RESULT_BALANCE.get(result, 0)
+        
+        last_game_at = game["created_at"]
+    
+    if last_game_at is not None:
+        oldest_day = window_start(last_game_at)
+        daily = {day: bucket for day, bucket in daily.items() if day >= oldest_day}
+    
+    return {
+        "current_streak": streak,
+        "longest_win_streak": longest_win,
+        "longest_loss_streak": longest_loss,
+        "last_game_at": last_game_at,
+        "daily": daily,
+    }
+
+
+def window_start(now: datetime) -> str:
+    return (now - timedelta(days=FORM_WINDOW_DAYS - 1)).date().isoformat()
+
+
+def summarize_window(daily: dict, now: datetime) -> dict:
+    oldest_day = window_start(now)
+    totals = [0, 0, 0, 0, 0]
+    for day, bucket in daily.items():
+        if day >= oldest_day:
+            totals = [total + value for total, value in zip(totals, bucket)]
+    
+    performance_rating = None
+    if totals[RATED_GAMES]:
+        performance_rating = round(
+            totals[RATING_SUM] / totals[RATED_GAMES]
+            + PERFORMANCE_RATING_SPREAD * totals[RATED_BALANCE] / totals[RATED_GAMES]
+        )
+    
+    return {
+        "window_games": totals[GAMES],
+        "window_score": round(totals[POINTS] / 2 / totals[GAMES], 4) if totals[GAMES] else 0.0,
+        "performance_rating": performance_rating,
+    }
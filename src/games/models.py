@@ -1,33 +1,199 @@
 from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy import (
+    ARRAY,
+    JSON,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    String,
+    TypeDecorator,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
+from src.games.constants import (
+    LICHESS_GAME_URL,
+    PERF_TYPES,
+    RESULTS,
+    TERMINATIONS,
+    USER_COLORS,
+)
 
+# only rows converted by the encoding migration can carry this code
+UNKNOWN_CODE = -1
 
-class Game(Base):
-    __tablename__ = "games"
+
+class CodedString(TypeDecorator):
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, values: tuple[str, ...]):
+        super().__init__()
+        self.values = values
+        self.codes = {value: code for code, value in enumerate(values)}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if value not in self.codes:
+            raise ValueError(f"{value!r} has no code; append it to the tuple in src/games/constants.py")
+        return self.codes[value]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if 0 <= value < len(self.values):
+            return self.values[value]
+        return "unknown"
+
+
+class LichessGame(Base):
+    __tablename__ = "lichess_games"
 
     id: Mapped[str] = mapped_column(String(16), primary_key=True)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    
-    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    perf_type: Mapped[str] = mapped_column(String(50), nullable=False)
     time_control: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    termination: Mapped[str] = mapped_column(CodedString(TERMINATIONS), nullable=False)
+    opening_eco: Mapped[str | None] = mapped_column(String(3), nullable=True)
+    opening_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+
+class GameColumns:
+    # one row per participant; created_at and perf_type stay here so per-user
+    # listing and filtering never need the canonical row
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    perf_type: Mapped[str] = mapped_column(CodedString(PERF_TYPES), nullable=False)
     
     opponent_name: Mapped[str] = mapped_column(String(255), nullable=False)
     opponent_rating: Mapped[int | None] = mapped_column(Integer, nullable=True)
     
-    user_color: Mapped[str] = mapped_column(String(10), nullable=False)
-    result: Mapped[str] = mapped_column(String(10), nullable=False)
-    termination: Mapped[str] = mapped_column(String(50), nullable=False)
+    user_color: Mapped[str] = mapped_column(CodedString(USER_COLORS), nullable=False)
+    result: Mapped[str] = mapped_column(CodedString(RESULTS), nullable=False)
     
-    url: Mapped[str] = mapped_column(String(512), nullable=False)
     imported_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    @property
+    def url(self) -> str:
+        return LICHESS_GAME_URL.format(game_id=self.id)
+
+    @property
+    def time_control(self) -> str | None:
+        return self.details.time_control
+
+    @property
+    def termination(self) -> str:
+        return self.details.termination
+
+
+class Game(GameColumns, Base):
+    __tablename__ = "games"
+
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    id: Mapped[str] = mapped_column(String(16), primary_key=True)
     
     user: Mapped["User"] = relationship("User", back_populates="games")
+    details: Mapped[LichessGame] = relationship(
+        primaryjoin="foreign(Game.id) == LichessGame.id",
+        lazy="raise",
+        viewonly=True
+    )
 
     __table_args__ = (
         Index("idx_games_user_created", "user_id", "created_at"),
         Index("idx_games_user_perf", "user_id", "perf_type"),
     )
+
+
+class GameStaging(GameColumns, Base):
+    __tablename__ = "games_staging"
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    id: Mapped[str] = mapped_column(String(16), primary_key=True)
+    
+    # canonical details, moves and clocks wait here too, so nothing live changes before the swap
+    time_control: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    termination: Mapped[str] = mapped_column(CodedString(TERMINATIONS), nullable=False)
+    opening_eco: Mapped[str | None] = mapped_column(String(3), nullable=True)
+    opening_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    moves: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    clock_initial: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    clock_increment: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    clocks: Mapped[list[int] | None] = mapped_column(ARRAY(Integer), nullable=True)
+
+
+class GameArchive(GameColumns, Base):
+    __tablename__ = "games_archive"
+
+    # the primary key doubles as the only index: per-user, newest-first scans
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    id: Mapped[str] = mapped_column(String(16), primary_key=True)
+    
+    details: Mapped[LichessGame] = relationship(
+        primaryjoin="foreign(GameArchive.id) == LichessGame.id",
+        lazy="raise",
+        viewonly=True
+    )
+
+
+class GameArchiveStats(Base):
+    __tablename__ = "games_archive_stats"
+
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    perf_type: Mapped[str] = mapped_column(CodedString(PERF_TYPES), primary_key=True)
+    games: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class GameMoves(Base):
+    __tablename__ = "game_moves"
+
+    game_id: Mapped[str] = mapped_column(String(16), primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    moves: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class OpeningStats(Base):
+    __tablename__ = "opening_stats"
+
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    user_color: Mapped[str] = mapped_column(CodedString(USER_COLORS), primary_key=True)
+    path: Mapped[str] = mapped_column(String(255), primary_key=True)
+    parent: Mapped[str] = mapped_column(String(255), nullable=False)
+    eco: Mapped[str | None] = mapped_column(String(3), nullable=True)
+    
+    wins: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    draws: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    losses: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index("idx_opening_stats_parent", "user_id", "user_color", "parent"),
+    )
+
+
+class GameForm(Base):
+    __tablename__ = "game_form"
+
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    perf_type: Mapped[str] = mapped_column(CodedString(PERF_TYPES), primary_key=True)
+    
+    current_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    longest_win_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    longest_loss_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_game_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    daily: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+
+
+class GameClocks(Base):
+    __tablename__ = "game_clocks"
+
+    game_id: Mapped[str] = mapped_column(String(16), primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    initial: Mapped[int] = mapped_column(Integer, nullable=False)
+    increment: Mapped[int] = mapped_column(Integer, nullable=False)
+    clocks: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+
+    __table_args__ = (
+        Index("idx_game_clocks_user", "user_id"),
+    )
@@ -1,29 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import json
+import time
+from datetime import datetime
+from uuid import uuid4
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from celery.result import AsyncResult
 from typing import Optional
 
-from src.database import get_db
+from src.config import settings
+from src.database import get_db, get_read_db
 from src.auth.dependencies import get_current_user
 from src.auth.models import User
-from src.games.models import Game
+from src.games.models import Game, GameArchive, GameForm, GameMoves, OpeningStats
+from src.games.form import summarize_window
+from src.games.utils import decode_moves
 from src.games.schemas import (
+    FormResponse,
+    GameFormResponse,
+    GameMovesResponse,
     GameResponse,
     GamesListResponse,
+    OpeningNodeResponse,
+    OpeningStatsResponse,
+    TimeUsageResponse,
     SyncResponse,
     SyncStatusResponse
 )
-from src.games.tasks import sync_user_games
-from src.celery_app import celery_app
+from src.games.service import (
+    compute_time_usage,
+    estimate_sync_size,
+    choose_sync_queue,
+    list_games,
+    read_task_meta,
+    build_sync_status
+)
+from src.games.constants import FORM_WINDOW_DAYS, PERF_TYPES, SYNC_QUEUE_BULK, SYNC_TERMINAL_STATES
+from src.tasks_client import send_task
+from src.rate_limit import RateLimit
+from src.etag import etag_matches, make_etag, not_modified, set_etag
+from src.cache import (
+    SYNC_PROGRESS_CHANNEL_PREFIX,
+    get_data_version,
+    get_redis,
+    get_opponents_cache,
+    get_time_usage_cache,
+    set_time_usage_cache,
+    claim_sync_lock,
+    enqueue_sync_engine_job
+)
 
 
 router = APIRouter(prefix="/api/games", tags=["games"])
 
+PERF_TYPE_PATTERN = f"^({'|'.join(PERF_TYPES)})$"
+
+sync_rate_limit = RateLimit(
+    "sync",
+    settings.sync_rate_limit_per_user,
+    settings.sync_rate_limit_per_ip,
+    settings.sync_rate_limit_window
+)
+
 
-@router.post("/sync", response_model=SyncResponse)
+@router.post("/sync", response_model=SyncResponse, dependencies=[Depends(sync_rate_limit)])
 async def trigger_games_sync(
+    store_moves: bool = False,
+    store_clocks: bool = False,
+    rebuild: bool = False,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db)
 ):
@@ -37,105 +82,261 @@ async def trigger_games_sync(
     if not user or not user.oauth_token:
         raise HTTPException(status_code=401, detail="OAuth token not found")
     
-    task = sync_user_games.delay(
-        user_id=user.id,
-        lichess_username=user.username,
-        access_token=user.oauth_token.access_token
+    task_id = str(uuid4())
+    active_task_id = await claim_sync_lock(
+        user.id,
+        task_id,
+        settings.task_time_limit
     )
+    if active_task_id:
+        return SyncResponse(
+            task_id=active_task_id,
+            message="Game synchronization already in progress"
+        )
+    
+    sync_kwargs = {
+        "user_id": user.id,
+        "lichess_username": user.username,
+        "access_token": user.oauth_token.access_token,
+        "enqueued_at": time.time(),
+        "store_moves": store_moves,
+        "store_clocks": store_clocks,
+    }
+    
+    if rebuild:
+        send_task(
+            "sync_user_games",
+            kwargs={**sync_kwargs, "rebuild": True},
+            queue=SYNC_QUEUE_BULK,
+            task_id=task_id
+        )
+        return SyncResponse(task_id=task_id, message="Game rebuild started")
+    
+    if settings.sync_engine == "async":
+        await enqueue_sync_engine_job({"task_id": task_id, **sync_kwargs})
+    else:
+        estimated_games = await estimate_sync_size(session, user)
+        send_task(
+            "sync_user_games",
+            kwargs=sync_kwargs,
+            queue=choose_sync_queue(estimated_games),
+            task_id=task_id
+        )
     
     return SyncResponse(
-        task_id=task.id,
+        task_id=task_id,
         message="Game synchronization started"
     )
 
 
 @router.get("/sync/status/{task_id}", response_model=SyncStatusResponse)
 async def get_sync_status(task_id: str):
-    task_result = AsyncResult(task_id, app=celery_app)
-    
-    if task_result.state == "PENDING":
-        response = SyncStatusResponse(
-            task_id=task_id,
-            state="PENDING",
-            current=0,
-            total=0,
-            percent=0,
-            message="Task is waiting to start"
-        )
-    elif task_result.state == "PROGRESS":
-        info = task_result.info or {}
-        response = SyncStatusResponse(
-            task_id=task_id,
-            state="PROGRESS",
-            current=info.get("current", 0),
-            total=info.get("total", 0),
-            percent=info.get("percent", 0),
-            message=info.get("message", "Processing...")
-        )
-    elif task_result.state == "SUCCESS":
-        result = task_result.result or {}
-        response = SyncStatusResponse(
-            task_id=task_id,
-            state="SUCCESS",
-            current=result.get("processed", 0),
-            total=result.get("total_games", 0),
-            percent=100,
-            message=result.get("message", "Completed"),
-            result=result
-        )
-    elif task_result.state == "FAILURE":
-        response = SyncStatusResponse(
-            task_id=task_id,
-            state="FAILURE",
-            current=0,
-            total=0,
-            percent=0,
-            message=str(task_result.info)
-        )
-    else:
-        response = SyncStatusResponse(
-            task_id=task_id,
-            state=task_result.state,
-            current=0,
-            total=0,
-            percent=0,
-            message="Unknown state"
-        )
+    state, info = await read_task_meta(task_id)
+    return build_sync_status(task_id, state, info)
+
+
+@router.get("/sync/stream/{task_id}")
+async def stream_sync_status(task_id: str, request: Request):
+    redis = await get_redis()
+    pubsub = redis.pubsub()
+    await pubsub.subscribe(f"{SYNC_PROGRESS_CHANNEL_PREFIX}{task_id}")
+    
+    async def events():
+        try:
+            status = await get_sync_status(task_id)
+            yield f"data: {status.model_dump_json()}\n\n"
+            if status.state in SYNC_TERMINAL_STATES:
+                return
+            
+            last_sent = time.monotonic()
+            while not await request.is_disconnected():
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=1.0
+                )
+                
+                if message is None:
+                    if time.monotonic() - last_sent >= settings.sync_stream_heartbeat:
+                        yield ": heartbeat\n\n"
+                        last_sent = time.monotonic()
+                    continue
+                
+                event = json.loads(message["data"])
+                status = build_sync_status(task_id, event["state"], event["info"])
+                yield f"data: {status.model_dump_json()}\n\n"
+                last_sent = time.monotonic()
+                
+                if status.state in SYNC_TERMINAL_STATES:
+                    return
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
     
-    return response
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.get("", response_model=GamesListResponse)
 async def get_games(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    perf_type: Optional[str] = None,
+    perf_type: Optional[str] = Query(None, pattern=PERF_TYPE_PATTERN),
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db)
+    session: AsyncSession = Depends(get_read_db)
 ):
-    query = select(Game).where(Game.user_id == current_user.id)
-    
-    if perf_type:
-        query = query.where(Game.perf_type == perf_type)
-    
-    query = query.order_by(Game.created_at.desc())
+    data_version = await get_data_version(current_user.id)
+    etag = make_etag(current_user.id, data_version, page, limit, perf_type)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await session.execute(count_query)
-    total = total_result.scalar()
-    
-    offset = (page - 1) * limit
-    query = query.offset(offset).limit(limit)
-    
-    result = await session.execute(query)
-    games = result.scalars().all()
+    games, total = await list_games(
+        session,
+        current_user.id,
+        perf_type,
+        (page - 1) * limit,
+        limit
+    )
     
     pages = (total + limit - 1) // limit
     
+    opponents = await get_opponents_cache([game.opponent_name for game in games])
+    
+    set_etag(response, etag)
     return GamesListResponse(
         items=[GameResponse.model_validate(game) for game in games],
+        opponents=opponents,
         total=total,
         page=page,
         limit=limit,
         pages=pages
     )
+
+
+@router.get("/time-usage", response_model=TimeUsageResponse)
+async def get_time_usage(
+    perf_type: Optional[str] = Query(None, pattern=PERF_TYPE_PATTERN),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db)
+):
+    cache_field = perf_type or "all"
+    cached = await get_time_usage_cache(current_user.id, cache_field)
+    if cached:
+        return TimeUsageResponse(**cached)
+    
+    time_usage = await compute_time_usage(session, current_user.id, perf_type)
+    await set_time_usage_cache(current_user.id, cache_field, time_usage)
+    
+    return TimeUsageResponse(**time_usage)
+
+
+@router.get("/form", response_model=GameFormResponse)
+async def get_form(
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db)
+):
+    result = await session.execute(
+        select(GameForm)
+        .where(GameForm.user_id == current_user.id)
+        .order_by(GameForm.last_game_at.desc())
+    )
+    now = datetime.utcnow()
+    
+    return GameFormResponse(
+        window_days=FORM_WINDOW_DAYS,
+        items=[
+            FormResponse(
+                perf_type=form.perf_type,
+                current_streak=form.current_streak,
+                longest_win_streak=form.longest_win_streak,
+                longest_loss_streak=form.longest_loss_streak,
+                last_game_at=form.last_game_at,
+                **summarize_window(form.daily, now)
+            )
+            for form in result.scalars()
+        ]
+    )
+
+
+@router.get("/openings", response_model=OpeningNodeResponse)
+async def get_openings(
+    color: str = Query("white", pattern="^(white|black)$"),
+    path: str = "",
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db)
+):
+    result = await session.execute(
+        select(OpeningStats).where(
+            OpeningStats.user_id == current_user.id,
+            OpeningStats.user_color == color,
+            (OpeningStats.path == path) | (OpeningStats.parent == path)
+        )
+    )
+    rows = result.scalars().all()
+    
+    node = next((row for row in rows if row.path == path), None)
+    children = [
+        OpeningStatsResponse(
+            path=row.path,
+            eco=row.eco,
+            wins=row.wins,
+            draws=row.draws,
+            losses=row.losses,
+            total=row.wins + row.draws + row.losses
+        )
+        for row in rows
+        if row.path != path
+    ]
+    children.sort(key=lambda child: child.total, reverse=True)
+    
+    if path and node is None:
+        raise HTTPException(status_code=404, detail="Opening not found")
+    
+    if node:
+        wins, draws, losses = node.wins, node.draws, node.losses
+    else:
+        wins = sum(child.wins for child in children)
+        draws = sum(child.draws for child in children)
+        losses = sum(child.losses for child in children)
+    
+    return OpeningNodeResponse(
+        path=path,
+        eco=node.eco if node else None,
+        wins=wins,
+        draws=draws,
+        losses=losses,
+        total=wins + draws + losses,
+        color=color,
+        children=children
+    )
+
+
+@router.get("/{game_id}/moves", response_model=GameMovesResponse)
+async def get_game_moves(
+    game_id: str,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db)
+):
+    result = await session.execute(
+        select(GameMoves.moves).where(
+            GameMoves.game_id == game_id,
+            select(Game.id).where(
+                Game.user_id == current_user.id,
+                Game.id == game_id
+            ).exists()
+            | select(GameArchive.id).where(
+                GameArchive.user_id == current_user.id,
+                GameArchive.id == game_id
+            ).exists()
+        )
+    )
+    moves = result.scalar_one_or_none()
+    
+    if moves is None:
+        raise HTTPException(status_code=404, detail="Moves not found for this game")
+    
+    return GameMovesResponse(id=game_id, moves=decode_moves(moves))
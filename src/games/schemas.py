@@ -19,14 +19,65 @@ class GameResponse(BaseModel):
         from_attributes = True
 
 
+class OpponentResponse(BaseModel):
+    id: str
+    username: str
+    title: Optional[str] = None
+    flag: Optional[str] = None
+    ratings: dict[str, int] = {}
+
+
 class GamesListResponse(BaseModel):
     items: list[GameResponse]
+    opponents: dict[str, OpponentResponse] = {}
     total: int
     page: int
     limit: int
     pages: int
 
 
+class GameMovesResponse(BaseModel):
+    id: str
+    moves: list[str]
+
+
+class OpeningStatsResponse(BaseModel):
+    path: str
+    eco: Optional[str] = None
+    wins: int
+    draws: int
+    losses: int
+    total: int
+
+
+class OpeningNodeResponse(OpeningStatsResponse):
+    color: str
+    children: list[OpeningStatsResponse]
+
+
+class TimeUsageResponse(BaseModel):
+    games: int
+    average_think_time: list[float]
+    time_trouble_rate: float
+    flag_rate: float
+
+
+class FormResponse(BaseModel):
+    perf_type: str
+    current_streak: int
+    longest_win_streak: int
+    longest_loss_streak: int
+    last_game_at: Optional[datetime]
+    window_games: int
+    window_score: float
+    performance_rating: Optional[int]
+
+
+class GameFormResponse(BaseModel):
+    window_days: int
+    items: list[FormResponse]
+
+
 class SyncResponse(BaseModel):
     task_id: str
     message: str
@@ -39,4 +90,5 @@ class SyncStatusResponse(BaseModel):
     total: int
     percent: int
     message: str
+    stats: Optional[dict] = None
     result: Optional[dict] = None
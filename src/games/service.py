@@ -0,0 +1,320 @@
+import json
+from itertools import chain
+from sqlalchemy import select, func, literal, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.config import settings
+from src.cache import get_redis
+from src.tasks_client import get_celery_app
+from src.auth.models import User
+from src.games.models import Game, GameArchive, GameArchiveStats, GameClocks, LichessGame
+from src.games.schemas import SyncStatusResponse
+from src.games.constants import (
+    SYNC_QUEUE_BULK,
+    SYNC_QUEUE_INCREMENTAL,
+    TIME_TROUBLE_FRACTION,
+    TIME_TROUBLE_MIN_CENTISECONDS,
+    TIME_USAGE_MAX_MOVES,
+)
+
+
+async def estimate_sync_size(session: AsyncSession, user: User) -> int:
+    result = await session.execute(
+        select(func.count()).select_from(Game).where(Game.user_id == user.id)
+    )
+    stored_games = result.scalar() + await count_archived_games(session, user.id)
+    return estimate_new_games(user.profile_data, stored_games)
+
+
+async def count_archived_games(
+    session: AsyncSession,
+    user_id: int,
+    perf_type: str | None = None
+) -> int:
+    query = select(func.coalesce(func.sum(GameArchiveStats.games), 0)).where(
+        GameArchiveStats.user_id == user_id
+    )
+    if perf_type:
+        query = query.where(GameArchiveStats.perf_type == perf_type)
+    return (await session.execute(query)).scalar()
+
+
+def select_archived_game_counts(user_ids: list[int]):
+    return (
+        select(GameArchiveStats.user_id, func.sum(GameArchiveStats.games))
+        .where(GameArchiveStats.user_id.in_(user_ids))
+        .group_by(GameArchiveStats.user_id)
+    )
+
+
+def select_archived_last_game_at(user_ids: list[int]):
+    # a correlated max walks the archive primary key backwards once per user
+    return select(
+        User.id,
+        select(func.max(GameArchive.created_at))
+        .where(GameArchive.user_id == User.id)
+        .scalar_subquery()
+    ).where(User.id.in_(user_ids))
+
+
+def select_existing_game_ids(user_id: int, games: list[dict]):
+    return union_all(
+        select(Game.id).where(
+            Game.user_id == user_id,
+            Game.id.in_([game["id"] for game in games])
+        ),
+        select(GameArchive.id).where(
+            GameArchive.user_id == user_id,
+            tuple_(GameArchive.created_at, GameArchive.id).in_(
+                [(game["created_at"], game["id"]) for game in games]
+            )
+        )
+    )
+
+
+async def list_games(
+    session: AsyncSession,
+    user_id: int,
+    perf_type: str | None,
+    offset: int,
+    limit: int
+) -> tuple[list, int]:
+    hot_query = select(Game).where(Game.user_id == user_id)
+    if perf_type:
+        hot_query = hot_query.where(Game.perf_type == perf_type)
+    
+    hot_total = (await session.execute(
+        select(func.count()).select_from(hot_query.subquery())
+    )).scalar()
+    archived_total = await count_archived_games(session, user_id, perf_type)
+    
+    hot_order = (Game.created_at.desc(), Game.id.desc())
+    hot_only = not archived_total
+    if not hot_only:
+        # the hot tier alone covers the page when its last hot row is newer
+        # than anything archived; both probes are one index step each
+        newest_archived = (await session.execute(
+            select(GameArchive.created_at)
+            .where(GameArchive.user_id == user_id)
+            .order_by(GameArchive.created_at.desc())
+            .limit(1)
+        )).scalar()
+        page_last = (await session.execute(
+            hot_query.with_only_columns(Game.created_at)
+            .order_by(*hot_order)
+            .offset(offset + limit - 1)
+            .limit(1)
+        )).scalar()
+        hot_only = page_last is not None and page_last > newest_archived
+    
+    if hot_only:
+        result = await session.execute(
+            hot_query
+            .options(selectinload(Game.details))
+            .order_by(*hot_order)
+            .offset(offset)
+            .limit(limit)
+        )
+        return list(result.scalars()), hot_total + archived_total
+    
+    # a backfill sync can store hot games older than archived ones, so page
+    # over both tiers and load the selected rows afterwards
+    tiers = []
+    for tier, model in (("hot", Game), ("archive", GameArchive)):
+        query = select(
+            literal(tier).label("tier"),
+            model.id,
+            model.created_at
+        ).where(model.user_id == user_id)
+        if perf_type:
+            query = query.where(model.perf_type == perf_type)
+        tiers.append(query)
+    
+    page = union_all(*tiers).subquery()
+    rows = (await session.execute(
+        select(page.c.tier, page.c.id, page.c.created_at)
+        .order_by(page.c.created_at.desc(), page.c.id.desc())
+        .offset(offset)
+        .limit(limit)
+    )).all()
+    
+    loaded = {}
+    hot_ids = [row.id for row in rows if row.tier == "hot"]
+    if hot_ids:
+        result = await session.execute(
+            select(Game)
+            .options(selectinload(Game.details))
+            .where(Game.user_id == user_id, Game.id.in_(hot_ids))
+        )
+        loaded.update((("hot", game.id), game) for game in result.scalars())
+    
+    archived_keys = [(row.created_at, row.id) for row in rows if row.tier == "archive"]
+    if archived_keys:
+        result = await session.execute(
+            select(GameArchive).options(selectinload(GameArchive.details)).where(
+                GameArchive.user_id == user_id,
+                tuple_(GameArchive.created_at, GameArchive.id).in_(archived_keys)
+            )
+        )
+        loaded.update((("archive", game.id), game) for game in result.scalars())
+    
+    games = [loaded[(row.tier, row.id)] for row in rows if (row.tier, row.id) in loaded]
+    return games, hot_total + archived_total
+
+
+def estimate_new_games(profile_data: dict | None, stored_games: int) -> int:
+    lichess_games = (profile_data or {}).get("count", {}).get("all")
+    if lichess_games is None:
+        return settings.bulk_sync_threshold if stored_games == 0 else 0
+    
+    return max(lichess_games - stored_games, 0)
+
+
+async def read_task_meta(task_id: str) -> tuple[str, object]:
+    backend = get_celery_app().backend
+    redis = await get_redis()
+    raw_meta = await redis.get(backend.get_key_for_task(task_id).decode())
+    if raw_meta is None:
+        return "PENDING", None
+    
+    meta = json.loads(raw_meta)
+    state = meta.get("status", "PENDING")
+    info = meta.get("result")
+    if state == "FAILURE" and isinstance(info, dict):
+        info = backend.exception_to_python(info)
+    
+    return state, info
+
+
+async def compute_time_usage(
+    session: AsyncSession,
+    user_id: int,
+    perf_type: str | None = None
+) -> dict:
+    import numpy as np
+    
+    games = select(Game.id, Game.perf_type, Game.result).where(Game.user_id == user_id)
+    if await count_archived_games(session, user_id, perf_type):
+        games = union_all(
+            games,
+            select(
+                GameArchive.id,
+                GameArchive.perf_type,
+                GameArchive.result
+            ).where(GameArchive.user_id == user_id)
+        )
+    games = games.subquery()
+    
+    query = (
+        select(
+            GameClocks.clocks,
+            GameClocks.initial,
+            GameClocks.increment,
+            (games.c.result == "loss") & (LichessGame.termination == "time")
+        )
+        .join(games, games.c.id == GameClocks.game_id)
+        .join(LichessGame, LichessGame.id == GameClocks.game_id)
+        .where(
+            GameClocks.user_id == user_id,
+            func.cardinality(GameClocks.clocks) > 0
+        )
+    )
+    if perf_type:
+        query = query.where(games.c.perf_type == perf_type)
+    
+    rows = (await session.execute(query)).all()
+    if not rows:
+        return {
+            "games": 0,
+            "average_think_time": [],
+            "time_trouble_rate": 0.0,
+            "flag_rate": 0.0,
+        }
+    
+    clocks, initials, increments, flagged = zip(*rows)
+    lengths = np.fromiter(map(len, clocks), dtype=np.int64, count=len(clocks))
+    flat = np.fromiter(chain.from_iterable(clocks), dtype=np.float64, count=int(lengths.sum()))
+    
+    width = int(lengths.max())
+    remaining = np.full((len(clocks), width), np.nan)
+    remaining[np.arange(width) < lengths[:, None]] = flat
+    
+    initial = np.asarray(initials, dtype=np.float64) * 100
+    increment = np.asarray(increments, dtype=np.float64) * 100
+    
+    previous = np.concatenate([initial[:, None], remaining[:, :-1]], axis=1)
+    think_time = (previous - remaining + increment[:, None]) / 100
+    average_think_time = np.nanmean(think_time[:, :TIME_USAGE_MAX_MOVES], axis=0)
+    
+    threshold = np.maximum(initial * TIME_TROUBLE_FRACTION, TIME_TROUBLE_MIN_CENTISECONDS)
+    in_time_trouble = np.nanmin(remaining, axis=1) < threshold
+    
+    return {
+        "games": len(clocks),
+        "average_think_time": np.round(average_think_time, 2).tolist(),
+        "time_trouble_rate": round(float(in_time_trouble.mean()), 4),
+        "flag_rate": round(float(np.asarray(flagged, dtype=bool).mean()), 4),
+    }
+
+
+def build_sync_status(task_id: str, state: str, info) -> SyncStatusResponse:
+    if state == "PENDING":
+        return SyncStatusResponse(
+            task_id=task_id,
+            state="PENDING",
+            current=0,
+            total=0,
+            percent=0,
+            message="Task is waiting to start"
+        )
+    
+    if state == "PROGRESS":
+        info = info or {}
+        return SyncStatusResponse(
+            task_id=task_id,
+            state="PROGRESS",
+            current=info.get("current", 0),
+            total=info.get("total", 0),
+            percent=info.get("percent", 0),
+            message=info.get("message", "Processing..."),
+            stats=info.get("stats")
+        )
+    
+    if state == "SUCCESS":
+        result = info or {}
+        return SyncStatusResponse(
+            task_id=task_id,
+            state="SUCCESS",
+            current=result.get("processed", 0),
+            total=result.get("total_games", 0),
+            percent=100,
+            message=result.get("message", "Completed"),
+            stats=result.get("stats"),
+            result=result
+        )
+    
+    if state == "FAILURE":
+        return SyncStatusResponse(
+            task_id=task_id,
+            state="FAILURE",
+            current=0,
+            total=0,
+            percent=0,
+            message=str(info)
+        )
+    
+    return SyncStatusResponse(
+        task_id=task_id,
+        state=state,
+        current=0,
+        total=0,
+        percent=0,
+        message="Unknown state"
+    )
+
+
+def choose_sync_queue(estimated_games: int) -> str:
+    if estimated_games >= settings.bulk_sync_threshold:
+        return SYNC_QUEUE_BULK
+    return SYNC_QUEUE_INCREMENTAL
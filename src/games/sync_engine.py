@@ -0,0 +1,324 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+
+import httpx
+from redis.asyncio import Redis
+
+from src.config import settings
+from src.database import AsyncSessionLocal, get_engine
+from src.celery_app import celery_app
+from src.cache import (
+    DATA_VERSION_PREFIX,
+    PRIMARY_STICKY_PREFIX,
+    SYNC_ENGINE_HEARTBEAT_PREFIX,
+    SYNC_ENGINE_JOBS_KEY,
+    SYNC_ENGINE_PROCESSING_PREFIX,
+    SYNC_LOCK_PREFIX,
+    SYNC_PROGRESS_CHANNEL_PREFIX,
+    SYNCS_IN_FLIGHT_KEY,
+    TIME_USAGE_CACHE_PREFIX,
+    WORKER_POOLS_KEY,
+)
+from src.metrics import SYNC_QUEUE_WAIT, observe_lichess_async_stream, pool_usage
+from src.games.tasks import (
+    SYNC_BATCH_SIZE,
+    SyncBatch,
+    SyncStats,
+    build_games_request,
+    enrich_opponents,
+    read_game_line,
+    write_batch,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    def __init__(self, redis: Redis, task_id: str):
+        self.redis = redis
+        self.task_id = task_id
+        self.meta_key = celery_app.backend.get_key_for_task(task_id).decode()
+        self.published_at: Optional[float] = None
+
+    async def store(self, state: str, info: dict):
+        meta = {
+            "status": state,
+            "result": info,
+            "traceback": None,
+            "children": [],
+            "date_done": datetime.utcnow().isoformat() if state == "SUCCESS" else None,
+            "task_id": self.task_id,
+        }
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.setex(self.meta_key, celery_app.conf.result_expires, json.dumps(meta))
+            pipe.publish(
+                f"{SYNC_PROGRESS_CHANNEL_PREFIX}{self.task_id}",
+                json.dumps({"state": state, "info": info})
+            )
+            await pipe.execute()
+
+    async def update(
+        self,
+        current: int,
+        total: int,
+        message: str = "",
+        stats: Optional[dict] = None,
+        force: bool = False
+    ):
+        now = time.monotonic()
+        if (
+            not force
+            and self.published_at is not None
+            and now - self.published_at < settings.sync_progress_min_interval
+        ):
+            return
+        self.published_at = now
+        
+        meta = {
+            "current": current,
+            "total": total,
+            "message": message,
+            "percent": int((current / total) * 100) if total > 0 else 0
+        }
+        if stats is not None:
+            meta["stats"] = stats
+        await self.store("PROGRESS", meta)
+
+
+class AsyncSyncEngine:
+    def __init__(self, concurrency: int, db_concurrency: int):
+        self.stream_slots = asyncio.Semaphore(concurrency)
+        self.db_slots = asyncio.Semaphore(db_concurrency)
+        self.redis = Redis.from_url(settings.redis_url, decode_responses=True)
+        self.client: Optional[httpx.AsyncClient] = None
+        self.jobs: set[asyncio.Task] = set()
+        # a restarted container reuses hostname and pid, so the token keeps a
+        # crashed run's processing list from looking alive to its successor
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex}"
+        self.processing_key = f"{SYNC_ENGINE_PROCESSING_PREFIX}{self.worker_id}"
+        get_engine()
+
+    async def run(self):
+        await self.heartbeat()
+        heartbeat = asyncio.create_task(self.keep_alive())
+        
+        try:
+            async with httpx.AsyncClient(timeout=300.0) as client:
+                self.client = client
+                while True:
+                    await self.stream_slots.acquire()
+                    # the job stays in this worker's processing list until run_job acks it
+                    raw_job = await self.redis.blmove(
+                        SYNC_ENGINE_JOBS_KEY,
+                        self.processing_key,
+                        settings.sync_engine_heartbeat_ttl,
+                        "LEFT",
+                        "RIGHT"
+                    )
+                    if raw_job is None:
+                        self.stream_slots.release()
+                        continue
+                    
+                    job = asyncio.create_task(self.run_job(raw_job))
+                    self.jobs.add(job)
+                    job.add_done_callback(self.jobs.discard)
+        finally:
+            heartbeat.cancel()
+
+    async def heartbeat(self):
+        await self.redis.set(
+            f"{SYNC_ENGINE_HEARTBEAT_PREFIX}{self.worker_id}",
+            "1",
+            ex=settings.sync_engine_heartbeat_ttl
+        )
+        await self.requeue_orphaned_jobs()
+
+    async def keep_alive(self):
+        while True:
+            await asyncio.sleep(settings.sync_engine_heartbeat_ttl / 3)
+            try:
+                await self.heartbeat()
+            except Exception:
+                logger.exception("Sync engine heartbeat failed")
+
+    async def requeue_orphaned_jobs(self):
+        async for processing_key in self.redis.scan_iter(match=f"{SYNC_ENGINE_PROCESSING_PREFIX}*"):
+            worker_id = processing_key.removeprefix(SYNC_ENGINE_PROCESSING_PREFIX)
+            if await self.redis.exists(f"{SYNC_ENGINE_HEARTBEAT_PREFIX}{worker_id}"):
+                continue
+            
+            requeued = 0
+            while await self.redis.lmove(processing_key, SYNC_ENGINE_JOBS_KEY, "RIGHT", "LEFT"):
+                requeued += 1
+            if requeued:
+                logger.warning("Requeued %d sync jobs from dead worker %s", requeued, worker_id)
+
+    async def run_job(self, raw_job: str):
+        job = json.loads(raw_job)
+        await self.redis.zadd(SYNCS_IN_FLIGHT_KEY, {job["task_id"]: time.time()})
+        try:
+            await self.sync_user_games(**job)
+        except Exception:
+            logger.exception("Sync job %s crashed", job.get("task_id"))
+        finally:
+            self.stream_slots.release()
+            await self.redis.lrem(self.processing_key, 1, raw_job)
+            await self.redis.zrem(SYNCS_IN_FLIGHT_KEY, job["task_id"])
+            await self.report_pool_usage()
+
+    async def report_pool_usage(self):
+        await self.redis.hset(
+            WORKER_POOLS_KEY,
+            self.worker_id,
+            json.dumps({
+                "engine": "sync_engine",
+                "updated_at": time.time(),
+                **pool_usage(get_engine().sync_engine.pool)
+            })
+        )
+
+    async def sync_user_games(
+        self,
+        task_id: str,
+        user_id: int,
+        lichess_username: str,
+        access_token: str,
+        max_games: Optional[int] = None,
+        enqueued_at: Optional[float] = None,
+        since: Optional[int] = None,
+        store_moves: bool = False,
+        store_clocks: bool = False
+    ):
+        if enqueued_at is not None:
+            SYNC_QUEUE_WAIT.labels("async_engine").observe(max(time.time() - enqueued_at, 0))
+        
+        progress = ProgressReporter(self.redis, task_id)
+        stats = SyncStats()
+        
+        batch = SyncBatch(user_id, store_moves, store_clocks)
+        opponent_names = set()
+        games_processed = 0
+        
+        try:
+            url, params, headers = build_games_request(
+                lichess_username,
+                access_token,
+                max_games=max_games,
+                since=since,
+                store_moves=store_moves,
+                store_clocks=store_clocks
+            )
+            
+            await progress.update(0, 1, "Starting game synchronization...", force=True)
+            
+            async with observe_lichess_async_stream(
+                "games_export",
+                self.client.stream("GET", url, params=params, headers=headers)
+            ) as response:
+                response.raise_for_status()
+                
+                lines = response.aiter_lines()
+                
+                while True:
+                    with stats.stage("stream_wait"):
+                        line = await anext(lines, None)
+                    if line is None:
+                        break
+                    
+                    stats.bytes_received = response.num_bytes_downloaded
+                    
+                    game = read_game_line(line, user_id, lichess_username, stats)
+                    if game is None:
+                        continue
+                    batch.add(*game)
+                    
+                    if len(batch) >= SYNC_BATCH_SIZE:
+                        games_processed += await self.flush_batch(batch, opponent_names, stats)
+                        await progress.update(
+                            games_processed,
+                            stats.games,
+                            f"Processed {games_processed} games...",
+                            stats.as_dict()
+                        )
+                        batch = SyncBatch(user_id, store_moves, store_clocks)
+                
+                if len(batch):
+                    games_processed += await self.flush_batch(batch, opponent_names, stats)
+                
+                stats.bytes_received = response.num_bytes_downloaded
+            
+            stats.observe()
+            
+            if games_processed:
+                await self.redis.delete(f"{TIME_USAGE_CACHE_PREFIX}{user_id}")
+            
+            if opponent_names:
+                await asyncio.to_thread(enrich_opponents.delay, sorted(opponent_names), user_id)
+            
+            result = {
+                "status": "completed",
+                "total_games": stats.games,
+                "processed": games_processed,
+                "skipped": stats.games - games_processed,
+                "message": f"Successfully synced {games_processed} new games",
+                "stats": stats.as_dict()
+            }
+        
+        except httpx.HTTPStatusError as e:
+            result = {
+                "status": "failed",
+                "error": f"Lichess API error: {e.response.status_code}"
+            }
+        
+        except Exception as e:
+            result = {
+                "status": "failed",
+                "error": str(e)
+            }
+        
+        finally:
+            lock_key = f"{SYNC_LOCK_PREFIX}{user_id}"
+            if await self.redis.get(lock_key) == task_id:
+                await self.redis.delete(lock_key)
+        
+        await progress.store("SUCCESS", result)
+
+    async def flush_batch(self, batch: SyncBatch, opponent_names: set, stats: SyncStats) -> int:
+        async with self.db_slots:
+            async with AsyncSessionLocal() as session:
+                new_games = await session.run_sync(write_batch, batch, stats)
+        
+        if not new_games:
+            return 0
+        opponent_names.update(game["opponent_name"] for game in new_games)
+        
+        if settings.database_replica_url:
+            await self.redis.setex(
+                f"{PRIMARY_STICKY_PREFIX}{batch.user_id}",
+                settings.read_your_writes_window,
+                "1"
+            )
+        await self.redis.set(f"{DATA_VERSION_PREFIX}{batch.user_id}", uuid4().hex)
+        
+        await asyncio.sleep(0)
+        return len(new_games)
+
+
+async def main():
+    engine = AsyncSyncEngine(
+        concurrency=settings.sync_engine_concurrency,
+        db_concurrency=settings.sync_engine_db_concurrency
+    )
+    await engine.run()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -1,38 +1,181 @@
 import json
+import os
+import random
+import socket
+import time
 import httpx
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from uuid import uuid4
 from typing import Optional
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker
+from redis import Redis
+from sqlalchemy import create_engine, delete, select, func, text, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
 from celery import Task
 
 from src.celery_app import celery_app
 from src.config import settings
-from src.games.models import Game
-from src.auth.models import User
+from src.cache import (
+    AUTO_SYNC_SLOTS_KEY,
+    DATA_VERSION_PREFIX,
+    OPPONENT_CACHE_PREFIX,
+    PRIMARY_STICKY_PREFIX,
+    SYNC_LOCK_PREFIX,
+    SYNC_PROGRESS_CHANNEL_PREFIX,
+    SYNCS_IN_FLIGHT_KEY,
+    TIME_USAGE_CACHE_PREFIX,
+    WORKER_POOLS_KEY,
+)
+from src.metrics import (
+    SYNC_BYTES_RECEIVED,
+    SYNC_GAMES_PER_SECOND,
+    SYNC_QUEUE_WAIT,
+    SYNC_STAGE_DURATION,
+    observe_lichess_response,
+    observe_lichess_stream,
+    pool_usage,
+    register_pool_gauges,
+)
+from src.auth.constants import LICHESS_USERS_URL
+from src.games.constants import PERF_TYPES
+from src.games.models import (
+    Game,
+    GameArchive,
+    GameArchiveStats,
+    GameClocks,
+    GameForm,
+    GameMoves,
+    GameStaging,
+    LichessGame,
+    OpeningStats,
+)
+from src.games.utils import encode_moves, opening_path
+from src.games.form import apply_games, empty_form, is_in_order
+from src.games.service import (
+    choose_sync_queue,
+    estimate_new_games,
+    select_archived_game_counts,
+    select_archived_last_game_at,
+    select_existing_game_ids,
+)
+from src.auth.models import User, OAuthToken
 
 
-engine = create_engine(
-    settings.database_url.replace("+asyncpg", ""),
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10
-)
-SessionLocal = sessionmaker(bind=engine)
+engine: Optional[Engine] = None
+SessionLocal = sessionmaker()
+
+
+def get_session() -> Session:
+    global engine
+    if engine is None:
+        engine = create_engine(
+            settings.database_url.replace("+asyncpg", ""),
+            pool_pre_ping=True,
+            pool_size=5,
+            max_overflow=10
+        )
+        register_pool_gauges("sync", engine.pool)
+        SessionLocal.configure(bind=engine)
+    return SessionLocal()
+
+
+OPPONENT_BATCH_SIZE = 300
+SYNC_BATCH_SIZE = 100
+
+RESULT_COUNTERS = {"win": "wins", "draw": "draws", "loss": "losses"}
+
+DETAIL_COLUMNS = LichessGame.__table__.columns.keys()
+PARTICIPANT_COLUMNS = Game.__table__.columns.keys()
+
+
+class SyncStats:
+    STAGES = ("stream_wait", "decode", "parse", "dedup", "insert")
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.timings = dict.fromkeys(self.STAGES, 0.0)
+        self.bytes_received = 0
+        self.moves_bytes_stored = 0
+        self.games = 0
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+
+    def as_dict(self) -> dict:
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            "elapsed": round(elapsed, 3),
+            "stages": {name: round(value, 3) for name, value in self.timings.items()},
+            "bytes_received": self.bytes_received,
+            "moves_bytes_stored": self.moves_bytes_stored,
+            "games_per_sec": round(self.games / elapsed, 1) if elapsed > 0 else 0,
+        }
+
+    def observe(self):
+        for name, value in self.timings.items():
+            SYNC_STAGE_DURATION.labels(name).observe(value)
+        SYNC_BYTES_RECEIVED.inc(self.bytes_received)
+        elapsed = time.perf_counter() - self.started_at
+        if elapsed > 0:
+            SYNC_GAMES_PER_SECOND.observe(self.games / elapsed)
 
 
 class GameSyncTask(Task):
-    def update_progress(self, current: int, total: int, message: str = ""):
-        self.update_state(
-            state='PROGRESS',
-            meta={
-                'current': current,
-                'total': total,
-                'message': message,
-                'percent': int((current / total) * 100) if total > 0 else 0
-            }
+    _redis: Optional[Redis] = None
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(settings.redis_url, decode_responses=True)
+        return self._redis
+
+    def publish_progress(self, state: str, info):
+        self.redis.publish(
+            f"{SYNC_PROGRESS_CHANNEL_PREFIX}{self.request.id}",
+            json.dumps({"state": state, "info": info})
         )
 
+    def update_progress(
+        self,
+        current: int,
+        total: int,
+        message: str = "",
+        stats: Optional[dict] = None,
+        force: bool = False
+    ):
+        now = time.monotonic()
+        last_published = getattr(self.request, "progress_published_at", None)
+        if (
+            not force
+            and last_published is not None
+            and now - last_published < settings.sync_progress_min_interval
+        ):
+            return
+        self.request.progress_published_at = now
+        
+        meta = {
+            'current': current,
+            'total': total,
+            'message': message,
+            'percent': int((current / total) * 100) if total > 0 else 0
+        }
+        if stats is not None:
+            meta['stats'] = stats
+        self.update_state(state='PROGRESS', meta=meta)
+        self.publish_progress('PROGRESS', meta)
+        report_pool_usage(self.redis)
+
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        info = retval if isinstance(retval, dict) else str(retval)
+        self.publish_progress(status, info)
+
 
 @celery_app.task(bind=True, base=GameSyncTask, name='sync_user_games')
 def sync_user_games(
@@ -40,107 +183,156 @@ def sync_user_games(
     user_id: int,
     lichess_username: str,
     access_token: str,
-    max_games: Optional[int] = None
+    max_games: Optional[int] = None,
+    enqueued_at: Optional[float] = None,
+    since: Optional[int] = None,
+    auto: bool = False,
+    store_moves: bool = False,
+    store_clocks: bool = False,
+    rebuild: bool = False
 ) -> dict:
-    session = SessionLocal()
+    redis = Redis.from_url(settings.redis_url, decode_responses=True)
     
-    try:
-        url = f"https://lichess.org/api/games/user/{lichess_username}"
-        
-        params = {
-            "pgnInJson": "false",
-            "clocks": "false",
-            "evals": "false",
-            "opening": "false",
-        }
+    if auto:
+        # claimed on start, not when scheduled, so a pending auto sync never blocks a manual one
+        if not redis.set(
+            f"{SYNC_LOCK_PREFIX}{user_id}",
+            self.request.id,
+            nx=True,
+            ex=settings.task_time_limit
+        ):
+            redis.close()
+            return {
+                "status": "skipped",
+                "message": "Game synchronization already in progress"
+            }
         
-        if max_games:
-            params["max"] = max_games
+        if not acquire_auto_sync_slot(redis, self.request.id):
+            release_sync_lock(redis, user_id, self.request.id)
+            redis.close()
+            raise self.retry(countdown=settings.auto_sync_retry_delay, max_retries=10)
+    
+    if enqueued_at is not None:
+        queue = (self.request.delivery_info or {}).get("routing_key", "unknown")
+        SYNC_QUEUE_WAIT.labels(queue).observe(max(time.time() - enqueued_at, 0))
+    
+    session = get_session()
+    redis.zadd(SYNCS_IN_FLIGHT_KEY, {self.request.id: time.time()})
+    
+    try:
+        url, params, headers = build_games_request(
+            lichess_username,
+            access_token,
+            max_games=max_games,
+            since=None if rebuild else since,
+            store_moves=store_moves,
+            store_clocks=store_clocks
+        )
         
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/x-ndjson"
-        }
+        if rebuild:
+            clear_staged_games(session, user_id)
         
         self.update_progress(0, 1, "Starting game synchronization...")
         
-        games_to_insert = []
+        batch = SyncBatch(user_id, store_moves, store_clocks)
+        opening_deltas = {}
+        opponent_names = set()
         games_processed = 0
-        games_skipped = 0
-        batch_size = 100
-        total_games = 0
+        stats = SyncStats()
         
         with httpx.Client(timeout=300.0) as client:
-            with client.stream("GET", url, params=params, headers=headers) as response:
+            with observe_lichess_stream(
+                "games_export",
+                client.stream("GET", url, params=params, headers=headers)
+            ) as response:
                 response.raise_for_status()
                 
-                for line in response.iter_lines():
-                    if not line.strip():
-                        continue
+                lines = response.iter_lines()
+                
+                while True:
+                    with stats.stage("stream_wait"):
+                        line = next(lines, None)
+                    if line is None:
+                        break
                     
-                    try:
-                        game_data = json.loads(line)
-                        total_games += 1
-                        
-                        game_id = game_data.get("id")
-                        existing = session.execute(
-                            select(Game).where(Game.id == game_id)
-                        ).scalar_one_or_none()
-                        
-                        if existing:
-                            games_skipped += 1
-                            continue
-                        
-                        parsed_game = parse_game_data(
-                            game_data=game_data,
-                            user_id=user_id,
-                            lichess_username=lichess_username
-                        )
-                        
-                        if parsed_game:
-                            games_to_insert.append(parsed_game)
-                            games_processed += 1
-                            
-                            if len(games_to_insert) >= batch_size:
-                                session.bulk_insert_mappings(Game, games_to_insert)
-                                session.commit()
-                                
-                                self.update_progress(
-                                    games_processed,
-                                    total_games,
-                                    f"Processed {games_processed} games..."
-                                )
-                                
-                                games_to_insert = []
+                    stats.bytes_received = response.num_bytes_downloaded
                     
-                    except json.JSONDecodeError:
-                        continue
-                    except Exception as e:
-                        print(f"Error processing game: {e}")
+                    game = read_game_line(line, user_id, lichess_username, stats)
+                    if game is None:
                         continue
+                    batch.add(*game)
+                    
+                    if len(batch) >= SYNC_BATCH_SIZE:
+                        games_processed += flush_sync_batch(
+                            session,
+                            redis,
+                            batch,
+                            stats,
+                            opponent_names,
+                            rebuild,
+                            opening_deltas
+                        )
+                        self.update_progress(
+                            games_processed,
+                            stats.games,
+                            f"Processed {games_processed} games...",
+                            stats.as_dict()
+                        )
+                        batch = SyncBatch(user_id, store_moves, store_clocks)
                 
-                if games_to_insert:
-                    session.bulk_insert_mappings(Game, games_to_insert)
-                    session.commit()
+                if len(batch):
+                    games_processed += flush_sync_batch(
+                        session,
+                        redis,
+                        batch,
+                        stats,
+                        opponent_names,
+                        rebuild,
+                        opening_deltas
+                    )
+                
+                stats.bytes_received = response.num_bytes_downloaded
+        
+        if rebuild:
+            with stats.stage("insert"):
+                swap_staged_games(session, user_id, opening_deltas, store_clocks)
+                mark_primary_sticky(redis, user_id)
+                bump_data_version(redis, user_id)
+        
+        stats.observe()
+        
+        if games_processed or rebuild:
+            redis.delete(f"{TIME_USAGE_CACHE_PREFIX}{user_id}")
+        
+        if opponent_names:
+            enrich_opponents.delay(sorted(opponent_names), user_id)
         
         result = {
             "status": "completed",
-            "total_games": total_games,
+            "total_games": stats.games,
             "processed": games_processed,
-            "skipped": games_skipped,
-            "message": f"Successfully synced {games_processed} new games"
+            "skipped": stats.games - games_processed,
+            "message": (
+                f"Successfully rebuilt {games_processed} games" if rebuild
+                else f"Successfully synced {games_processed} new games"
+            ),
+            "stats": stats.as_dict()
         }
         
         self.update_progress(
             games_processed,
-            total_games,
-            f"Completed! Synced {games_processed} new games"
+            stats.games,
+            f"Completed! {result['message']}",
+            result["stats"],
+            force=True
         )
         
         return result
     
     except httpx.HTTPStatusError as e:
         session.rollback()
+        if rebuild:
+            clear_staged_games(session, user_id)
         error_msg = f"Lichess API error: {e.response.status_code}"
         return {
             "status": "failed",
@@ -149,6 +341,8 @@ def sync_user_games(
     
     except Exception as e:
         session.rollback()
+        if rebuild:
+            clear_staged_games(session, user_id)
         return {
             "status": "failed",
             "error": str(e)
@@ -156,6 +350,676 @@ def sync_user_games(
     
     finally:
         session.close()
+        if auto:
+            redis.zrem(AUTO_SYNC_SLOTS_KEY, self.request.id)
+        release_sync_lock(redis, user_id, self.request.id)
+        redis.zrem(SYNCS_IN_FLIGHT_KEY, self.request.id)
+        report_pool_usage(redis)
+        redis.close()
+
+
+def build_games_request(
+    lichess_username: str,
+    access_token: str,
+    max_games: Optional[int] = None,
+    since: Optional[int] = None,
+    store_moves: bool = False,
+    store_clocks: bool = False
+) -> tuple[str, dict, dict]:
+    url = f"https://lichess.org/api/games/user/{lichess_username}"
+    
+    params = {
+        "pgnInJson": "false",
+        "clocks": "true" if store_clocks else "false",
+        "evals": "false",
+        "opening": "true",
+        "moves": "true" if store_moves else "false",
+    }
+    
+    # oldest-first lets game form fold each batch in order, but "max" has to
+    # keep meaning the newest games, so capped syncs stay newest-first and
+    # their batches fall back to recomputing the form
+    if max_games:
+        params["max"] = max_games
+    else:
+        params["sort"] = "dateAsc"
+    
+    if since:
+        params["since"] = since
+    
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Accept": "application/x-ndjson"
+    }
+    
+    return url, params, headers
+
+
+def build_moves_row(game_data: dict, user_id: int) -> dict:
+    return {
+        "game_id": game_data["id"],
+        "user_id": user_id,
+        "moves": encode_moves(game_data["moves"])
+    }
+
+
+def build_clocks_row(game_data: dict, parsed_game: dict) -> dict:
+    return {
+        "game_id": parsed_game["id"],
+        "user_id": parsed_game["user_id"],
+        "initial": game_data["clock"].get("initial", 0),
+        "increment": game_data["clock"].get("increment", 0),
+        "clocks": game_data["clocks"][0 if parsed_game["user_color"] == "white" else 1::2]
+    }
+
+
+class SyncBatch:
+    def __init__(self, user_id: int, store_moves: bool, store_clocks: bool):
+        self.user_id = user_id
+        self.store_moves = store_moves
+        self.store_clocks = store_clocks
+        self.games = []
+        self.moves = []
+        self.clocks = []
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def add(self, game_data: dict, parsed_game: dict):
+        self.games.append(parsed_game)
+        if self.store_moves and game_data.get("moves"):
+            self.moves.append(build_moves_row(game_data, self.user_id))
+        if self.store_clocks and game_data.get("clocks") and game_data.get("clock"):
+            self.clocks.append(build_clocks_row(game_data, parsed_game))
+
+
+def read_game_line(
+    line: str,
+    user_id: int,
+    lichess_username: str,
+    stats: SyncStats
+) -> Optional[tuple[dict, dict]]:
+    if not line.strip():
+        return None
+    
+    try:
+        with stats.stage("decode"):
+            game_data = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    stats.games += 1
+    
+    try:
+        with stats.stage("parse"):
+            parsed_game = parse_game_data(
+                game_data=game_data,
+                user_id=user_id,
+                lichess_username=lichess_username
+            )
+    except Exception as e:
+        print(f"Error processing game: {e}")
+        return None
+    
+    if not parsed_game:
+        return None
+    return game_data, parsed_game
+
+
+def write_batch(
+    session,
+    batch: SyncBatch,
+    stats: SyncStats,
+    rebuild: bool = False,
+    opening_deltas: Optional[dict] = None
+) -> list[dict]:
+    games = batch.games
+    if not rebuild:
+        with stats.stage("dedup"):
+            existing = set(session.execute(
+                select_existing_game_ids(batch.user_id, games)
+            ).scalars())
+        games = [game for game in games if game["id"] not in existing]
+        if not games:
+            return []
+    
+    new_ids = {game["id"] for game in games}
+    moves = [row for row in batch.moves if row["game_id"] in new_ids]
+    clocks = [row for row in batch.clocks if row["game_id"] in new_ids]
+    
+    with stats.stage("insert"):
+        if rebuild:
+            stage_batch(session, games, moves, clocks)
+            aggregate_opening_stats(games, opening_deltas)
+        else:
+            insert_batch(session, games, moves, clocks)
+    
+    stats.moves_bytes_stored += sum(len(row["moves"]) for row in moves)
+    return games
+
+
+def flush_sync_batch(
+    session,
+    redis: Redis,
+    batch: SyncBatch,
+    stats: SyncStats,
+    opponent_names: set,
+    rebuild: bool,
+    opening_deltas: dict
+) -> int:
+    new_games = write_batch(session, batch, stats, rebuild, opening_deltas)
+    opponent_names.update(game["opponent_name"] for game in new_games)
+    
+    if new_games and not rebuild:
+        mark_primary_sticky(redis, batch.user_id)
+        bump_data_version(redis, batch.user_id)
+    return len(new_games)
+
+
+def split_game_rows(games: list[dict]) -> tuple[list[dict], list[dict]]:
+    return (
+        [{column: game[column] for column in DETAIL_COLUMNS} for game in games],
+        [{column: game[column] for column in PARTICIPANT_COLUMNS if column in game} for game in games],
+    )
+
+
+def insert_batch(session, games: list[dict], moves: list[dict], clocks: list[dict]):
+    details, participants = split_game_rows(games)
+    session.execute(insert(LichessGame).values(details).on_conflict_do_nothing())
+    session.bulk_insert_mappings(Game, participants)
+    if moves:
+        session.execute(insert(GameMoves).values(moves).on_conflict_do_nothing())
+    if clocks:
+        session.bulk_insert_mappings(GameClocks, clocks)
+    update_opening_stats(session, games)
+    update_game_form(session, games)
+    session.commit()
+
+
+def stage_batch(session, games: list[dict], moves: list[dict], clocks: list[dict]):
+    staged_moves = {row["game_id"]: row["moves"] for row in moves}
+    staged_clocks = {row["game_id"]: row for row in clocks}
+    
+    rows = []
+    for game in games:
+        clock = staged_clocks.get(game["id"], {})
+        rows.append({
+            **{column: game[column] for column in DETAIL_COLUMNS},
+            **{column: game[column] for column in PARTICIPANT_COLUMNS if column in game},
+            "moves": staged_moves.get(game["id"]),
+            "clock_initial": clock.get("initial"),
+            "clock_increment": clock.get("increment"),
+            "clocks": clock.get("clocks"),
+        })
+    
+    session.bulk_insert_mappings(GameStaging, rows)
+    session.commit()
+
+
+def clear_staged_games(session, user_id: int):
+    session.execute(delete(GameStaging).where(GameStaging.user_id == user_id))
+    session.commit()
+
+
+def swap_staged_games(session, user_id: int, opening_deltas: dict, store_clocks: bool):
+    staged = GameStaging.__table__.c
+    
+    session.execute(text("SET LOCAL lock_timeout = '5s'"))
+    
+    statement = insert(LichessGame).from_select(
+        DETAIL_COLUMNS,
+        select(*[staged[column] for column in DETAIL_COLUMNS])
+        .where(staged.user_id == user_id)
+    )
+    session.execute(statement.on_conflict_do_update(
+        index_elements=["id"],
+        set_={
+            column: statement.excluded[column]
+            for column in DETAIL_COLUMNS
+            if column != "id"
+        }
+    ))
+    
+    session.execute(delete(Game).where(Game.user_id == user_id))
+    session.execute(insert(Game).from_select(
+        PARTICIPANT_COLUMNS,
+        select(*[staged[column] for column in PARTICIPANT_COLUMNS])
+        .where(staged.user_id == user_id)
+    ))
+    
+    statement = insert(GameMoves).from_select(
+        ["game_id", "user_id", "moves"],
+        select(staged.id, staged.user_id, staged.moves)
+        .where(staged.user_id == user_id, staged.moves.is_not(None))
+    )
+    session.execute(statement.on_conflict_do_update(
+        index_elements=["game_id"],
+        set_={"moves": statement.excluded.moves}
+    ))
+    
+    # a rebuild that did not fetch clocks keeps the stored ones of games it still has
+    if store_clocks:
+        session.execute(delete(GameClocks).where(GameClocks.user_id == user_id))
+        session.execute(insert(GameClocks).from_select(
+            ["game_id", "user_id", "initial", "increment", "clocks"],
+            select(staged.id, staged.user_id, staged.clock_initial, staged.clock_increment, staged.clocks)
+            .where(staged.user_id == user_id, staged.clocks.is_not(None))
+        ))
+    else:
+        session.execute(delete(GameClocks).where(
+            GameClocks.user_id == user_id,
+            GameClocks.game_id.not_in(select(staged.id).where(staged.user_id == user_id))
+        ))
+    
+    session.execute(delete(GameArchive).where(GameArchive.user_id == user_id))
+    session.execute(delete(GameArchiveStats).where(GameArchiveStats.user_id == user_id))
+    session.execute(delete(OpeningStats).where(OpeningStats.user_id == user_id))
+    write_opening_stats(session, opening_deltas)
+    session.execute(delete(GameStaging).where(GameStaging.user_id == user_id))
+    rebuild_game_form(session, user_id)
+    session.commit()
+
+
+def form_state(form: GameForm) -> dict:
+    return {
+        "current_streak": form.current_streak,
+        "longest_win_streak": form.longest_win_streak,
+        "longest_loss_streak": form.longest_loss_streak,
+        "last_game_at": form.last_game_at,
+        "daily": form.daily,
+    }
+
+
+def update_game_form(session, games: list[dict]):
+    grouped = {}
+    for game in games:
+        grouped.setdefault((game["user_id"], game["perf_type"]), []).append(game)
+    
+    # a user without any form yet (new, or stored before forms existed) may have
+    # perf types that only live in the archive, so fold their whole history once
+    rebuilt = set()
+    for user_id in {user_id for user_id, _ in grouped}:
+        has_form = session.execute(
+            select(GameForm.perf_type).where(GameForm.user_id == user_id).limit(1)
+        ).first()
+        if has_form is None:
+            rebuild_game_form(session, user_id)
+            rebuilt.add(user_id)
+    
+    for (user_id, perf_type), perf_games in grouped.items():
+        if user_id in rebuilt:
+            continue
+        
+        form = session.get(GameForm, (user_id, perf_type))
+        if form is None or not is_in_order(form_state(form), perf_games):
+            rebuild_game_form(session, user_id, perf_type)
+            continue
+        
+        session.merge(GameForm(
+            user_id=user_id,
+            perf_type=perf_type,
+            **apply_games(form_state(form), perf_games)
+        ))
+
+
+def rebuild_game_form(session, user_id: int, perf_type: Optional[str] = None):
+    tiers = []
+    for model in (Game, GameArchive):
+        query = select(
+            model.id,
+            model.perf_type,
+            model.created_at,
+            model.result,
+            model.opponent_rating
+        ).where(model.user_id == user_id)
+        if perf_type:
+            query = query.where(model.perf_type == perf_type)
+        tiers.append(query)
+    
+    grouped = {}
+    for game in session.execute(union_all(*tiers)).mappings():
+        grouped.setdefault(game["perf_type"], []).append(game)
+    
+    stale = delete(GameForm).where(GameForm.user_id == user_id)
+    if perf_type:
+        stale = stale.where(GameForm.perf_type == perf_type)
+    if grouped:
+        stale = stale.where(GameForm.perf_type.not_in(list(grouped)))
+    session.execute(stale)
+    
+    for form_perf_type, perf_games in grouped.items():
+        session.merge(GameForm(
+            user_id=user_id,
+            perf_type=form_perf_type,
+            **apply_games(empty_form(), perf_games)
+        ))
+
+
+def update_opening_stats(session, games: list[dict]):
+    write_opening_stats(session, aggregate_opening_stats(games))
+
+
+def aggregate_opening_stats(games: list[dict], deltas: Optional[dict] = None) -> dict:
+    if deltas is None:
+        deltas = {}
+    for game in games:
+        if not game.get("opening_name"):
+            continue
+        
+        paths = opening_path(game["opening_name"])
+        for depth, path in enumerate(paths):
+            key = (game["user_id"], game["user_color"], path)
+            if key not in deltas:
+                deltas[key] = {
+                    "user_id": game["user_id"],
+                    "user_color": game["user_color"],
+                    "path": path,
+                    "parent": paths[depth - 1] if depth > 0 else "",
+                    "eco": game["opening_eco"],
+                    "wins": 0,
+                    "draws": 0,
+                    "losses": 0,
+                }
+            deltas[key][RESULT_COUNTERS[game["result"]]] += 1
+    return deltas
+
+
+def write_opening_stats(session, deltas: dict):
+    if not deltas:
+        return
+    
+    statement = insert(OpeningStats).values(list(deltas.values()))
+    session.execute(statement.on_conflict_do_update(
+        index_elements=["user_id", "user_color", "path"],
+        set_={
+            "wins": OpeningStats.wins + statement.excluded.wins,
+            "draws": OpeningStats.draws + statement.excluded.draws,
+            "losses": OpeningStats.losses + statement.excluded.losses,
+        }
+    ))
+
+
+def acquire_auto_sync_slot(redis: Redis, task_id: str) -> bool:
+    now = time.time()
+    # a worker killed at the hard time limit never releases its slot, so
+    # slots older than that limit are pruned before counting
+    with redis.pipeline(transaction=True) as pipe:
+        pipe.zremrangebyscore(AUTO_SYNC_SLOTS_KEY, "-inf", now - settings.task_time_limit)
+        pipe.zadd(AUTO_SYNC_SLOTS_KEY, {task_id: now})
+        pipe.zcard(AUTO_SYNC_SLOTS_KEY)
+        _, _, running = pipe.execute()
+    
+    if running > settings.auto_sync_max_concurrency:
+        redis.zrem(AUTO_SYNC_SLOTS_KEY, task_id)
+        return False
+    return True
+
+
+def release_sync_lock(redis: Redis, user_id: int, task_id: str):
+    lock_key = f"{SYNC_LOCK_PREFIX}{user_id}"
+    if redis.get(lock_key) == task_id:
+        redis.delete(lock_key)
+
+
+def report_pool_usage(redis: Redis, name: str = "sync"):
+    if engine is None:
+        return
+    redis.hset(
+        WORKER_POOLS_KEY,
+        f"{socket.gethostname()}:{os.getpid()}",
+        json.dumps({"engine": name, "updated_at": time.time(), **pool_usage(engine.pool)})
+    )
+
+
+def mark_primary_sticky(redis: Redis, user_id: int):
+    if settings.database_replica_url:
+        redis.setex(
+            f"{PRIMARY_STICKY_PREFIX}{user_id}",
+            settings.read_your_writes_window,
+            "1"
+        )
+
+
+def bump_data_version(redis: Redis, user_id: int):
+    redis.set(f"{DATA_VERSION_PREFIX}{user_id}", uuid4().hex)
+
+
+@celery_app.task(name='schedule_auto_syncs')
+def schedule_auto_syncs() -> dict:
+    session = get_session()
+    redis = Redis.from_url(settings.redis_url, decode_responses=True)
+    
+    try:
+        active_since = datetime.utcnow() - timedelta(days=settings.auto_sync_active_days)
+        users = session.execute(
+            select(User.id, User.username, User.profile_data, OAuthToken.access_token)
+            .join(OAuthToken, OAuthToken.user_id == User.id)
+            .where(User.last_login_at >= active_since)
+            .order_by(User.id)
+        ).all()
+        
+        if not users:
+            return {"status": "completed", "scheduled": 0, "skipped": 0}
+        
+        game_stats = {
+            user_id: (stored_games, last_game_at)
+            for user_id, stored_games, last_game_at in session.execute(
+                select(Game.user_id, func.count(), func.max(Game.created_at))
+                .where(Game.user_id.in_([user.id for user in users]))
+                .group_by(Game.user_id)
+            )
+        }
+        archived_games = dict(session.execute(
+            select_archived_game_counts([user.id for user in users])
+        ).all())
+        archived_last_game_at = dict(session.execute(
+            select_archived_last_game_at([user.id for user in users])
+        ).all())
+        
+        spacing = settings.auto_sync_interval / len(users)
+        scheduled = 0
+        skipped = 0
+        
+        for index, user in enumerate(users):
+            if redis.exists(f"{SYNC_LOCK_PREFIX}{user.id}"):
+                skipped += 1
+                continue
+            
+            countdown = index * spacing + random.uniform(0, settings.auto_sync_jitter)
+            
+            stored_games, last_game_at = game_stats.get(user.id, (0, None))
+            stored_games += archived_games.get(user.id, 0)
+            last_game_at = max(
+                filter(None, (last_game_at, archived_last_game_at.get(user.id))),
+                default=None
+            )
+            queue = choose_sync_queue(estimate_new_games(user.profile_data, stored_games))
+            
+            sync_user_games.apply_async(
+                kwargs={
+                    "user_id": user.id,
+                    "lichess_username": user.username,
+                    "access_token": user.access_token,
+                    "enqueued_at": time.time() + countdown,
+                    "since": int(last_game_at.timestamp() * 1000) + 1 if last_game_at else None,
+                    "auto": True,
+                },
+                queue=queue,
+                countdown=countdown
+            )
+            scheduled += 1
+        
+        return {"status": "completed", "scheduled": scheduled, "skipped": skipped}
+    
+    finally:
+        session.close()
+        redis.close()
+
+
+@celery_app.task(name='archive_old_games')
+def archive_old_games() -> dict:
+    if not settings.archive_after_days:
+        return {"status": "disabled", "archived": 0}
+    
+    cutoff = datetime.utcnow() - timedelta(days=settings.archive_after_days)
+    session = get_session()
+    archived = 0
+    
+    try:
+        user_ids = session.execute(select(User.id).order_by(User.id)).scalars().all()
+        
+        for user_id in user_ids:
+            while True:
+                game_ids = session.execute(
+                    select(Game.id)
+                    .where(Game.user_id == user_id, Game.created_at < cutoff)
+                    .limit(settings.archive_batch_size)
+                ).scalars().all()
+                if not game_ids:
+                    break
+                
+                archived += archive_games(session, user_id, game_ids)
+        
+        return {"status": "completed", "archived": archived}
+    
+    finally:
+        session.close()
+
+
+def archive_games(session, user_id: int, game_ids: list[str]) -> int:
+    games = Game.__table__
+    rows = session.execute(
+        games.delete()
+        .where(games.c.user_id == user_id, games.c.id.in_(game_ids))
+        .returning(*games.c)
+    ).mappings().all()
+    if not rows:
+        session.commit()
+        return 0
+    
+    session.execute(
+        insert(GameArchive),
+        sorted((dict(row) for row in rows), key=lambda row: row["created_at"])
+    )
+    
+    counts = {}
+    for row in rows:
+        key = (row["user_id"], row["perf_type"])
+        counts[key] = counts.get(key, 0) + 1
+    
+    statement = insert(GameArchiveStats).values([
+        {"user_id": user_id, "perf_type": perf_type, "games": games_count}
+        for (user_id, perf_type), games_count in counts.items()
+    ])
+    session.execute(statement.on_conflict_do_update(
+        index_elements=["user_id", "perf_type"],
+        set_={"games": GameArchiveStats.games + statement.excluded.games}
+    ))
+    session.commit()
+    return len(rows)
+
+
+@celery_app.task(name='recompute_game_form')
+def recompute_game_form(user_id: Optional[int] = None) -> dict:
+    session = get_session()
+    
+    try:
+        if user_id is None:
+            user_ids = session.execute(select(User.id).order_by(User.id)).scalars().all()
+        else:
+            user_ids = [user_id]
+        
+        for form_user_id in user_ids:
+            rebuild_game_form(session, form_user_id)
+            session.commit()
+        
+        return {"status": "completed", "users": len(user_ids)}
+    
+    finally:
+        session.close()
+
+
+@celery_app.task(name='enrich_opponents')
+def enrich_opponents(opponent_names: list[str], user_id: Optional[int] = None) -> dict:
+    redis = Redis.from_url(settings.redis_url, decode_responses=True)
+    
+    try:
+        opponent_ids = sorted({
+            name.lower() for name in opponent_names
+            if name and name != "Anonymous"
+        })
+        if not opponent_ids:
+            return {"status": "completed", "fetched": 0}
+        
+        cached = redis.mget(
+            [f"{OPPONENT_CACHE_PREFIX}{opponent_id}" for opponent_id in opponent_ids]
+        )
+        missing = [
+            opponent_id for opponent_id, data in zip(opponent_ids, cached)
+            if data is None
+        ]
+        
+        fetched = 0
+        
+        with httpx.Client(timeout=30.0) as client:
+            for i in range(0, len(missing), OPPONENT_BATCH_SIZE):
+                batch = missing[i:i + OPPONENT_BATCH_SIZE]
+                response = client.post(
+                    LICHESS_USERS_URL,
+                    content=",".join(batch),
+                    headers={"Content-Type": "text/plain"}
+                )
+                observe_lichess_response("users", response)
+                response.raise_for_status()
+                
+                with redis.pipeline(transaction=False) as pipe:
+                    for user_data in response.json():
+                        pipe.setex(
+                            f"{OPPONENT_CACHE_PREFIX}{user_data['id']}",
+                            settings.opponent_cache_ttl,
+                            json.dumps(parse_opponent_data(user_data))
+                        )
+                        fetched += 1
+                    pipe.execute()
+        
+        if fetched and user_id is not None:
+            bump_data_version(redis, user_id)
+        
+        return {
+            "status": "completed",
+            "cached": len(opponent_ids) - len(missing),
+            "fetched": fetched
+        }
+    
+    except httpx.HTTPStatusError as e:
+        return {
+            "status": "failed",
+            "error": f"Lichess API error: {e.response.status_code}"
+        }
+    
+    except Exception as e:
+        return {
+            "status": "failed",
+            "error": str(e)
+        }
+    
+    finally:
+        redis.close()
+
+
+def parse_opponent_data(user_data: dict) -> dict:
+    perfs = user_data.get("perfs", {})
+    
+    return {
+        "id": user_data.get("id"),
+        "username": user_data.get("username"),
+        "title": user_data.get("title"),
+        "flag": user_data.get("profile", {}).get("flag"),
+        "ratings": {
+            perf_type: perf_data["rating"]
+            for perf_type, perf_data in perfs.items()
+            if isinstance(perf_data, dict) and "rating" in perf_data
+        }
+    }
 
 
 def parse_game_data(game_data: dict, user_id: int, lichess_username: str) -> Optional[dict]:
@@ -183,6 +1047,8 @@ def parse_game_data(game_data: dict, user_id: int, lichess_username: str) -> Opt
         game_id = game_data.get("id")
         created_at = datetime.fromtimestamp(game_data.get("createdAt", 0) / 1000)
         perf_type = game_data.get("perf")
+        if perf_type not in PERF_TYPES:
+            raise ValueError(f"unknown perf type {perf_type!r} in game {game_data.get('id')}")
         
         clock = game_data.get("clock", {})
         time_control = None
@@ -200,7 +1066,7 @@ def parse_game_data(game_data: dict, user_id: int, lichess_username: str) -> Opt
         status = game_data.get("status")
         termination = map_termination(status)
         
-        game_url = f"https://lichess.org/{game_id}"
+        opening = game_data.get("opening", {})
         
         return {
             "id": game_id,
@@ -213,7 +1079,8 @@ def parse_game_data(game_data: dict, user_id: int, lichess_username: str) -> Opt
             "user_color": user_color,
             "result": result,
             "termination": termination,
-            "url": game_url,
+            "opening_eco": opening.get("eco"),
+            "opening_name": opening.get("name"),
             "imported_at": datetime.utcnow()
         }
     
@@ -0,0 +1,23 @@
+import zlib
+
+
+def encode_moves(moves: str) -> bytes:
+    return zlib.compress(moves.encode("ascii"), 9)
+
+
+def opening_path(opening_name: str) -> list[str]:
+    family, _, variation = opening_name.partition(": ")
+    paths = [family]
+    
+    prefix = f"{family}:"
+    separator = " "
+    for part in variation.split(", ") if variation else []:
+        prefix = f"{prefix}{separator}{part}"
+        separator = ", "
+        paths.append(prefix)
+    
+    return paths
+
+
+def decode_moves(data: bytes) -> list[str]:
+    return zlib.decompress(data).decode("ascii").split()
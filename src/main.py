@@ -1,7 +1,12 @@
-from fastapi import FastAPI
+import time
+from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from src.config import settings
+from src.capacity import get_capacity, require_capacity_token
+from src.metrics import HTTP_REQUEST_DURATION
+from src.profiling import profile_db_queries
 from src.auth.router import router as auth_router
 from src.profile.router import router as profile_router
 from src.games.router import router as games_router
@@ -21,6 +26,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def track_request_latency(request: Request, call_next):
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start_time
+    
+    route = request.scope.get("route")
+    HTTP_REQUEST_DURATION.labels(
+        request.method,
+        route.path if route else "unmatched",
+        str(response.status_code)
+    ).observe(elapsed)
+    
+    return response
+
+
+if settings.db_profiling_enabled:
+    app.middleware("http")(profile_db_queries)
+
+
 app.include_router(auth_router)
 app.include_router(profile_router)
 app.include_router(games_router)
@@ -29,3 +55,18 @@ app.include_router(games_router)
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+if settings.capacity_token:
+    @app.get(
+        "/internal/capacity",
+        include_in_schema=False,
+        dependencies=[Depends(require_capacity_token)]
+    )
+    async def capacity():
+        return await get_capacity()
@@ -0,0 +1,138 @@
+import httpx
+from contextlib import asynccontextmanager, contextmanager
+from sqlalchemy import event
+from prometheus_client import Counter, Gauge, Histogram
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by key family and result",
+    ["family", "result"],
+)
+
+LICHESS_REQUEST_DURATION = Histogram(
+    "lichess_request_duration_seconds",
+    "Lichess upstream call latency",
+    ["endpoint"],
+)
+
+LICHESS_REQUESTS = Counter(
+    "lichess_requests_total",
+    "Lichess upstream calls by status code",
+    ["endpoint", "status"],
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Overflow connections currently open beyond pool_size",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+
+SYNC_STAGE_DURATION = Histogram(
+    "sync_stage_duration_seconds",
+    "Cumulative time per game sync spent in each stage",
+    ["stage"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800),
+)
+
+SYNC_BYTES_RECEIVED = Counter(
+    "sync_bytes_received_total",
+    "Bytes streamed from Lichess by game syncs",
+)
+
+SYNC_GAMES_PER_SECOND = Histogram(
+    "sync_games_per_second",
+    "Games streamed per second over a whole sync",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+
+
+SYNC_QUEUE_WAIT = Histogram(
+    "sync_queue_wait_seconds",
+    "Time a game sync waited in its queue before starting",
+    ["queue"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 300, 600, 1800),
+)
+
+
+RATE_LIMITED = Counter(
+    "rate_limited_requests_total",
+    "Requests rejected by the rate limiter",
+    ["limit"],
+)
+
+
+def observe_cache(family: str, hit: bool, count: int = 1):
+    CACHE_REQUESTS.labels(family, "hit" if hit else "miss").inc(count)
+
+
+def observe_lichess_response(endpoint: str, response: httpx.Response):
+    LICHESS_REQUEST_DURATION.labels(endpoint).observe(response.elapsed.total_seconds())
+    LICHESS_REQUESTS.labels(endpoint, str(response.status_code)).inc()
+
+
+# a streamed response only has elapsed once it is closed, so observe on exit,
+# including when the stream fails part way
+@contextmanager
+def observe_lichess_stream(endpoint: str, stream):
+    response = None
+    try:
+        with stream as response:
+            yield response
+    finally:
+        if response is not None:
+            observe_lichess_response(endpoint, response)
+
+
+@asynccontextmanager
+async def observe_lichess_async_stream(endpoint: str, stream):
+    response = None
+    try:
+        async with stream as response:
+            yield response
+    finally:
+        if response is not None:
+            observe_lichess_response(endpoint, response)
+
+
+def pool_usage(pool) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+# set on pool events rather than with set_function, which the multiprocess
+# collector in the Celery workers never calls
+def register_pool_gauges(name: str, pool):
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    overflow = DB_POOL_OVERFLOW.labels(name)
+    
+    def on_checkout(*args):
+        checked_out.set(pool.checkedout())
+        overflow.set(max(pool.overflow(), 0))
+    
+    def on_checkin(*args):
+        # checkin fires before the connection is returned; with the idle
+        # queue already full it gets closed and the overflow shrinks
+        closing = pool.checkedin() >= pool.size()
+        checked_out.set(pool.checkedout() - 1)
+        overflow.set(max(pool.overflow() - closing, 0))
+    
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
@@ -1,5 +1,5 @@
 from src.database import Base
 from src.auth.models import User, OAuthToken
-from src.games.models import Game
+from src.games.models import Game, GameArchive, GameArchiveStats, GameClocks, GameForm, GameMoves, GameStaging, LichessGame, OpeningStats
 
-__all__ = ["Base", "User", "OAuthToken", "Game"]
+__all__ = ["Base", "User", "OAuthToken", "Game", "GameArchive", "GameArchiveStats", "GameClocks", "GameForm", "GameMoves", "GameStaging", "LichessGame", "OpeningStats"]
@@ -1,36 +1,51 @@
-from fastapi import APIRouter, Depends, Response
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, Request, Response
 import time
 
-from src.database import get_db
+from src.config import settings
 from src.auth.models import User
 from src.auth.dependencies import get_current_user
 from src.profile.schemas import ProfileResponse, PerfRating
 from src.profile.service import fetch_user_profile
 from src.profile.dependencies import get_lichess_token
-from src.cache import get_profile_cache, set_profile_cache
+from src.tasks_client import send_task
+from src.rate_limit import RateLimit
+from src.etag import etag_matches, make_etag, not_modified, set_etag
+from src.cache import get_profile_cache, set_profile_cache, queue_profile_write
 
 
 router = APIRouter(prefix="/api/profile", tags=["profile"])
 
+profile_rate_limit = RateLimit(
+    "profile",
+    settings.profile_rate_limit_per_user,
+    settings.profile_rate_limit_per_ip,
+    settings.profile_rate_limit_window
+)
+
 
 @router.get("", response_model=ProfileResponse)
 async def get_profile(
+    request: Request,
     response: Response,
     current_user: User = Depends(get_current_user),
-    access_token: str = Depends(get_lichess_token),
-    db: AsyncSession = Depends(get_db)
+    access_token: str = Depends(get_lichess_token)
 ):
     start_time = time.time()
     
     cached_profile = await get_profile_cache(current_user.id)
     
     if cached_profile:
+        etag = make_etag(cached_profile)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
         elapsed = time.time() - start_time
+        set_etag(response, etag)
         response.headers["X-Cache-Status"] = "HIT"
         response.headers["X-Response-Time"] = f"{elapsed:.3f}s"
-        return ProfileResponse(**cached_profile)
+        return ProfileResponse.model_validate_json(cached_profile)
     
+    await profile_rate_limit(request)
     lichess_data = await fetch_user_profile(access_token)
     
     perfs = lichess_data.get("perfs", {})
@@ -56,10 +71,11 @@ async def get_profile(
     )
     
     profile_dict = profile_response.model_dump()
-    await set_profile_cache(current_user.id, profile_dict)
+    cached_profile = await set_profile_cache(current_user.id, profile_dict)
+    set_etag(response, make_etag(cached_profile))
     
-    current_user.profile_data = lichess_data
-    await db.commit()
+    if await queue_profile_write(current_user.id, lichess_data):
+        send_task("flush_profile_writes", countdown=settings.profile_write_flush_delay)
     
     elapsed = time.time() - start_time
     response.headers["X-Cache-Status"] = "MISS"
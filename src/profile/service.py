@@ -1,5 +1,6 @@
 import httpx
 from src.auth.constants import LICHESS_ACCOUNT_URL
+from src.metrics import observe_lichess_response
 
 
 async def fetch_user_profile(access_token: str) -> dict:
@@ -8,5 +9,6 @@ async def fetch_user_profile(access_token: str) -> dict:
             LICHESS_ACCOUNT_URL,
             headers={"Authorization": f"Bearer {access_token}"}
         )
+        observe_lichess_response("account", response)
         response.raise_for_status()
         return response.json()
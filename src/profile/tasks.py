@@ -0,0 +1,85 @@
+import json
+from redis import Redis
+from redis.exceptions import ResponseError
+
+from src.celery_app import celery_app
+from src.config import settings
+from src.cache import (
+    PROFILE_WRITES_KEY,
+    PROFILE_WRITES_PROCESSING_KEY,
+    PROFILE_WRITES_SCHEDULED_KEY,
+)
+from src.auth.models import User
+from src.games.tasks import get_session
+
+
+@celery_app.task(name='flush_profile_writes')
+def flush_profile_writes() -> dict:
+    redis = Redis.from_url(settings.redis_url, decode_responses=True)
+    
+    try:
+        # writes queued from here on schedule their own flush
+        redis.delete(PROFILE_WRITES_SCHEDULED_KEY)
+        try:
+            # leaves a processing hash from a crashed flush in place so it is retried first
+            redis.renamenx(PROFILE_WRITES_KEY, PROFILE_WRITES_PROCESSING_KEY)
+        except ResponseError:
+            pass
+        
+        pending = redis.hgetall(PROFILE_WRITES_PROCESSING_KEY)
+        if not pending:
+            return {"status": "completed", "flushed": 0}
+        
+        result = write_profiles(redis, pending)
+        redis.delete(PROFILE_WRITES_PROCESSING_KEY)
+        schedule_flush(redis)
+        return result
+    
+    finally:
+        redis.close()
+
+
+def write_profiles(redis: Redis, pending: dict[str, str]) -> dict:
+    user_ids = list(pending)
+    written = 0
+    session = get_session()
+    
+    try:
+        batch_size = settings.profile_write_batch_size
+        for i in range(0, len(user_ids), batch_size):
+            batch = user_ids[i:i + batch_size]
+            session.bulk_update_mappings(User, [
+                {"id": int(user_id), "profile_data": json.loads(pending[user_id])}
+                for user_id in batch
+            ])
+            session.commit()
+            written += len(batch)
+        
+        return {"status": "completed", "flushed": written}
+    
+    except Exception as e:
+        session.rollback()
+        # a newer queued write for the same user wins over the one that failed
+        with redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids[written:]:
+                pipe.hsetnx(PROFILE_WRITES_KEY, user_id, pending[user_id])
+            pipe.execute()
+        
+        return {
+            "status": "failed",
+            "flushed": written,
+            "error": str(e)
+        }
+    
+    finally:
+        session.close()
+
+
+def schedule_flush(redis: Redis):
+    if redis.hlen(PROFILE_WRITES_KEY) and redis.set(
+        PROFILE_WRITES_SCHEDULED_KEY,
+        "1",
+        nx=True,
+        ex=settings.profile_write_flush_delay
+    ):
+        flush_profile_writes.apply_async(countdown=settings.profile_write_flush_delay)
@@ -0,0 +1,70 @@
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: Optional[str] = None
+
+
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def install_query_profiling(engine: Engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = query_stats.get()
+        if stats is None:
+            return
+        
+        stats.count += 1
+        stats.total_time += elapsed
+        if elapsed > stats.slowest_time:
+            stats.slowest_time = elapsed
+            stats.slowest_statement = statement
+
+
+async def profile_db_queries(request: Request, call_next):
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        query_stats.reset(token)
+    
+    total_ms = stats.total_time * 1000
+    response.headers["X-DB-Query-Count"] = str(stats.count)
+    response.headers["Server-Timing"] = (
+        f'db;dur={total_ms:.1f};desc="{stats.count} queries"'
+    )
+    
+    if total_ms >= settings.db_slow_request_ms:
+        logger.warning(
+            "Slow DB request %s %s: %d queries, %.1fms total, slowest %.1fms: %s",
+            request.method,
+            request.url.path,
+            stats.count,
+            total_ms,
+            stats.slowest_time * 1000,
+            stats.slowest_statement,
+        )
+    
+    return response
@@ -0,0 +1,35 @@
+import math
+from fastapi import HTTPException, Request, status
+
+from src.cache import hit_rate_limit
+from src.metrics import RATE_LIMITED
+from src.auth.utils import get_token_user_id
+
+
+class RateLimit:
+    def __init__(self, name: str, per_user: int, per_ip: int, window: int):
+        self.name = name
+        self.per_user = per_user
+        self.per_ip = per_ip
+        self.window = window
+
+    async def __call__(self, request: Request):
+        limits = {}
+        
+        user_id = get_token_user_id(request)
+        if user_id is not None and self.per_user:
+            limits[f"{self.name}:user:{user_id}"] = self.per_user
+        if request.client and self.per_ip:
+            limits[f"{self.name}:ip:{request.client.host}"] = self.per_ip
+        
+        if not limits:
+            return
+        
+        retry_after_ms = await hit_rate_limit(limits, self.window)
+        if retry_after_ms:
+            RATE_LIMITED.labels(self.name).inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after_ms / 1000))}
+            )
@@ -0,0 +1,14 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from celery import Celery
+    from celery.result import AsyncResult
+
+
+def get_celery_app() -> "Celery":
+    from src.celery_app import celery_app
+    return celery_app
+
+
+def send_task(name: str, **options) -> "AsyncResult":
+    return get_celery_app().send_task(name, **options)